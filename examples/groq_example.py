@@ -13,10 +13,10 @@ Run this example:
 """
 
 import os
+import sys
 from open_compute import (
     PatientJourney,
     JourneyStage,
-    generate_fhir_from_journey,
 )
 
 
@@ -30,11 +30,16 @@ def main():
         print("\nExample: export GROQ_API_KEY='your-api-key-here'")
         return
 
-    print("=" * 70)
-    print("GROQ FHIR GENERATION EXAMPLE")
-    print("=" * 70)
-    print("\n🚀 Using Groq for ultra-fast FHIR generation!")
-    print("Model: openai/gpt-oss-120b (120B parameter model)\n")
+    # Imported after the key check, the LLM client libraries are slow to load
+    from open_compute import generate_fhir_from_journey
+
+    sys.stdout.write("\n".join([
+        "=" * 70,
+        "GROQ FHIR GENERATION EXAMPLE",
+        "=" * 70,
+        "\n🚀 Using Groq for ultra-fast FHIR generation!",
+        "Model: openai/gpt-oss-120b (120B parameter model)\n",
+    ]) + "\n")
 
     # Create a simple patient journey
     journey = PatientJourney(
@@ -86,13 +91,14 @@ def main():
     Non-smoker.
     """
 
-    print("📋 Patient Journey Created")
-    print(f"   - Patient: {journey.patient_id}")
-    print(f"   - Stages: {len(journey.stages)}")
-    print(f"   - Summary: {journey.summary}\n")
-
-    print("⚡ Generating FHIR resources with Groq...")
-    print("   (This should be very fast!)\n")
+    sys.stdout.write("\n".join([
+        "📋 Patient Journey Created",
+        f"   - Patient: {journey.patient_id}",
+        f"   - Stages: {len(journey.stages)}",
+        f"   - Summary: {journey.summary}\n",
+        "⚡ Generating FHIR resources with Groq...",
+        "   (This should be very fast!)\n",
+    ]) + "\n")
 
     # Generate FHIR resources using Groq
     result = generate_fhir_from_journey(
@@ -103,50 +109,59 @@ def main():
         fhir_version="R4",
         max_iterations=3,
         auto_save=True,
+        # Set LLM_CACHE_DIR to replay responses on re-runs instead of calling Groq
+        cache_directory=os.getenv("LLM_CACHE_DIR"),
     )
 
-    # Display results
-    print("\n" + "=" * 70)
-    print("RESULTS")
-    print("=" * 70)
-
-    if result.success:
-        print("✅ FHIR Generation Successful!")
-    else:
-        print("⚠️  FHIR Generation Incomplete")
-
-    print(f"\nIterations: {result.iterations}")
-    print(f"Resources Generated: {len(result.generated_resources)}")
+    # Display results, collected and written in one go
+    lines = [
+        "\n" + "=" * 70,
+        "RESULTS",
+        "=" * 70,
+        "✅ FHIR Generation Successful!" if result.success else "⚠️  FHIR Generation Incomplete",
+        f"\nIterations: {result.iterations}",
+        f"Resources Generated: {len(result.generated_resources)}",
+    ]
 
     if result.planning_details:
-        print(f"\n📝 Planning Rationale:")
-        print(f"   {result.planning_details.rationale}")
+        lines.append("\n📝 Planning Rationale:")
+        lines.append(f"   {result.planning_details.rationale}")
 
-    print("\n📦 Generated Resources:")
-    for i, resource in enumerate(result.generated_resources, 1):
-        resource_type = resource.get("resourceType", "Unknown")
-        resource_id = resource.get("id", "no-id")
-        print(f"   {i}. {resource_type}/{resource_id}")
+    lines.append("\n📦 Generated Resources:")
+    lines.extend(
+        f"   {i}. {r.get('resourceType', 'Unknown')}/{r.get('id', 'no-id')}"
+        for i, r in enumerate(result.generated_resources, 1)
+    )
 
-    print("\n✓ Validation Summary:")
-    valid_count = sum(1 for v in result.validation_results if v.is_valid)
-    print(f"   Valid: {valid_count}/{len(result.validation_results)}")
+    # One pass over the validation results for both the count and the failures
+    valid_count = 0
+    invalid_types = []
+    for validation in result.validation_results:
+        if validation.is_valid:
+            valid_count += 1
+        else:
+            invalid_types.append(validation.resource_type or "Unknown")
+    lines.append("\n✓ Validation Summary:")
+    lines.append(f"   Valid: {valid_count}/{len(result.validation_results)}")
+    if invalid_types:
+        lines.append(f"   Invalid: {', '.join(invalid_types)}")
 
     if result.errors:
-        print("\n⚠️  Errors:")
-        for error in result.errors:
-            print(f"   - {error}")
-
-    print("\n💾 Files saved to: output/jane_smith/")
-    print("   - patient_bundle.json (FHIR Bundle)")
-    print("   - bulk_fhir.jsonl (NDJSON format)")
-    print("   - README.txt (Summary)")
-
-    print("\n" + "=" * 70)
-    print("🎉 Example Complete!")
-    print("=" * 70)
-    print("\n💡 Tip: Try comparing the speed with OpenAI by setting:")
-    print("   LLM_PROVIDER=openai and running the basic example")
+        lines.append("\n⚠️  Errors:")
+        lines.extend(f"   - {error}" for error in result.errors)
+
+    lines.extend([
+        f"\n💾 Files saved to: {result.saved_path or 'output/jane_smith/'}",
+        "   - patient_bundle.json (FHIR Bundle)",
+        "   - bulk_fhir.jsonl (NDJSON format)",
+        "   - README.txt (Summary)",
+        "\n" + "=" * 70,
+        "🎉 Example Complete!",
+        "=" * 70,
+        "\n💡 Tip: Try comparing the speed with OpenAI by setting:",
+        "   LLM_PROVIDER=openai and running the basic example",
+    ])
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -19,21 +19,18 @@ Run this example:
 """
 
 import os
+import sys
 import json
+import asyncio
+import traceback
 from open_compute import (
     PatientJourney,
     JourneyStage,
-    generate_fhir_from_journey,
-    AIJourneyToFHIR,
 )
 
 
-def example_basic_usage():
-    """Basic example of generating FHIR from a journey."""
-    print("=" * 60)
-    print("Example 1: Basic Usage")
-    print("=" * 60)
-
+def get_provider_and_model():
+    """Determine the LLM provider and model from env vars (or defaults)."""
     # Determine which provider to use (from env var or default to openai)
     llm_provider = os.getenv("LLM_PROVIDER", "openai")
 
@@ -43,10 +40,11 @@ def example_basic_usage():
     else:
         model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-    print(f"\nUsing LLM Provider: {llm_provider.upper()}")
-    print(f"Using Model: {model}\n")
+    return llm_provider, model
 
-    # Create a patient journey
+
+def create_chest_pain_journey():
+    """Create the chest pain / myocardial infarction journey used by the examples."""
     journey = PatientJourney(
         patient_id="patient-123",
         summary="58 year old male presents to ER with chest pain and is diagnosed with acute myocardial infarction",
@@ -104,58 +102,150 @@ def example_basic_usage():
     Non-smoker, occasional alcohol use.
     """
 
-    # Generate FHIR resources using AI
-    # Make sure the appropriate API key is set in your environment based on provider
-    # Note: auto_save is enabled by default, so resources will be saved to output/firstname_lastname/
-    result = generate_fhir_from_journey(
-        journey=journey,
-        patient_context=patient_context,
-        model=model,
-        fhir_version="R4",
-        max_iterations=3,
-        auto_save=True,  # Automatically saves to output/firstname_lastname/ folder
-        llm_provider=llm_provider,  # Use the provider from env var
+    return journey, patient_context
+
+
+def create_pneumonia_journey():
+    """Create the primary care pneumonia journey used by the examples."""
+    journey = PatientJourney(
+        patient_id="patient-456",
+        summary="65 year old female presents to primary care with fever and cough",
+        stages=[
+            JourneyStage(
+                name="Chief Complaint",
+                description="Patient reports fever (101°F) and productive cough for 3 days",
+                metadata={"location": "Primary Care Clinic"},
+            ),
+            JourneyStage(
+                name="Diagnosis",
+                description="Diagnosed with community-acquired pneumonia",
+                metadata={
+                    "condition": "Community-acquired pneumonia",
+                    "icd10_code": "J18.9",
+                },
+            ),
+            JourneyStage(
+                name="Treatment",
+                description="Prescribed amoxicillin 500mg three times daily for 7 days",
+                metadata={"medications": ["Amoxicillin 500mg TID x 7 days"]},
+            ),
+        ],
     )
 
-    # Check results
-    print(f"\n{'='*60}")
-    print("Generation Results")
-    print("=" * 60)
-    print(f"Success: {result.success}")
-    print(f"Iterations: {result.iterations}")
-    print(f"Resources Generated: {len(result.generated_resources)}")
+    patient_context = """
+    Patient is named Jane Smith, a 65-year-old female.
+    Medical history: Type 2 diabetes mellitus, well-controlled.
+    """
+
+    return journey, patient_context
+
+
+def print_result(title, result):
+    """Print the outcome of a single journey generation."""
+    # Build the whole report first and write it once: fewer writes, and the
+    # reports of concurrently running examples do not interleave line by line
+    lines = [
+        "",
+        "=" * 60,
+        title,
+        "=" * 60,
+        f"Success: {result.success}",
+        f"Iterations: {result.iterations}",
+        f"Resources Generated: {len(result.generated_resources)}",
+    ]
 
     if result.planning_details:
-        print(f"\nPlanning Rationale: {result.planning_details.rationale}")
+        lines.append(
+            f"\nPlanning Rationale: {result.planning_details.rationale}")
 
-    print("\nGenerated Resources:")
-    for i, resource in enumerate(result.generated_resources, 1):
-        resource_type = resource.get("resourceType", "Unknown")
-        resource_id = resource.get("id", "no-id")
-        print(f"  {i}. {resource_type}/{resource_id}")
+    lines.append("\nGenerated Resources:")
+    lines.extend(
+        f"  {i}. {r.get('resourceType', 'Unknown')}/{r.get('id', 'no-id')}"
+        for i, r in enumerate(result.generated_resources, 1)
+    )
 
-    print("\nValidation Results:")
+    lines.append("\nValidation Results:")
+    valid_count = 0
     for i, validation in enumerate(result.validation_results, 1):
         status = "✓ Valid" if validation.is_valid else "✗ Invalid"
-        print(f"  {i}. {validation.resource_type}: {status}")
-        if not validation.is_valid:
-            for error in validation.errors:
-                print(f"     - {error}")
+        lines.append(f"  {i}. {validation.resource_type}: {status}")
+        if validation.is_valid:
+            valid_count += 1
+        else:
+            lines.extend(f"     - {error}" for error in validation.errors)
+    lines.append(f"  Valid: {valid_count}/{len(result.validation_results)}")
 
     if result.errors:
-        print("\nErrors:")
-        for error in result.errors:
-            print(f"  - {error}")
+        lines.append("\nErrors:")
+        lines.extend(f"  - {error}" for error in result.errors)
 
     # Files are automatically saved to output/firstname_lastname/ folder with:
     # - patient_bundle.json: Complete FHIR Bundle
     # - bulk_fhir.jsonl: All resources in JSONL format (one resource per line)
     # - README.txt: Summary of generated resources
+    if result.saved_path:
+        lines.append(f"\nFiles saved to: {result.saved_path}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
+
+async def example_basic_usage(agent):
+    """Basic example of generating FHIR from a journey."""
+    journey, patient_context = create_chest_pain_journey()
+
+    # Generate FHIR resources using the shared agent
+    # Note: auto_save is enabled by default, so resources will be saved to output/firstname_lastname/
+    result = await agent.agenerate_from_journey(journey, patient_context)
+
+    print_result("Example 1: Basic Usage - Chest Pain", result)
     return result
 
 
-def main():
+async def example_primary_care_usage(agent):
+    """Generate FHIR for a primary care visit."""
+    journey, patient_context = create_pneumonia_journey()
+
+    result = await agent.agenerate_from_journey(journey, patient_context)
+
+    print_result("Example 2: Primary Care - Pneumonia", result)
+    return result
+
+
+def example_batch_usage(agent):
+    """
+    Generate FHIR for several journeys in one Batch API job.
+
+    Batch jobs are billed at a discount but can take up to 24 hours to
+    complete, so this example only runs when requested explicitly:
+        python examples/patient_journey_to_fhir_example.py --batch
+
+    Add --combined to save every patient's resources to a single
+    output/all_patients.jsonl instead of one folder per patient.
+    """
+    sys.stdout.write("\n".join(["=" * 60, "Example 3: Batch Usage", "=" * 60]) + "\n")
+
+    # Each producer contributes one journey to the same batch job
+    journeys, patient_contexts = zip(
+        create_chest_pain_journey(),
+        create_pneumonia_journey(),
+    )
+
+    results = agent.generate_from_journeys_batch(
+        list(journeys), list(patient_contexts),
+        combined_save="--combined" in sys.argv)
+
+    lines = ["", "=" * 60, "Batch Generation Results", "=" * 60]
+    lines.extend(
+        f"{journey.patient_id}: success={result.success}, "
+        f"resources={len(result.generated_resources)}, errors={len(result.errors)}"
+        for journey, result in zip(journeys, results)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    return results
+
+
+async def main():
     """Run all examples."""
     # Check for API key based on provider
     llm_provider = os.getenv("LLM_PROVIDER", "openai")
@@ -171,22 +261,62 @@ def main():
             print("Example: export OPENAI_API_KEY='your-api-key-here'")
             return
 
-    print("Patient Journey to FHIR Generation")
-    print("=" * 60)
-    print(f"\nUsing LLM Provider: {llm_provider.upper()}")
-    print("These examples will use the LLM API to generate FHIR resources.")
-    print("This may take a minute or two...")
+    sys.stdout.write("\n".join([
+        "Patient Journey to FHIR Generation",
+        "=" * 60,
+        f"\nUsing LLM Provider: {llm_provider.upper()}",
+        "These examples will use the LLM API to generate FHIR resources.",
+        "This may take a minute or two...",
+    ]) + "\n")
 
     # Run examples
     try:
-        example_basic_usage()
+        # One agent is shared by all examples: it loads the FHIR schema and
+        # enhanced context (valuesets, profiles, search parameters) once and
+        # keeps the parsed structures for every journey it processes.
+        # Imported here so a missing API key exits before the LLM client
+        # libraries are loaded
+        from open_compute import AIJourneyToFHIR
+
+        llm_provider, model = get_provider_and_model()
+        print(f"Using Model: {model}\n")
+        batch = "--batch" in sys.argv
+        combined = "--combined" in sys.argv
+        agent = AIJourneyToFHIR(
+            model=model,
+            fhir_version="R4",
+            max_iterations=3,
+            use_enhanced_context=True,
+            llm_provider=llm_provider,
+            # With --combined the concurrent examples skip the per-patient
+            # folders and all results are written to one file at the end
+            auto_save=batch or not combined,
+            pretty_json="--pretty" in sys.argv,
+            # Set LLM_CACHE_DIR to replay LLM responses on re-runs
+            cache_directory=os.getenv("LLM_CACHE_DIR"),
+        )
+
+        try:
+            if batch:
+                # The batch example polls synchronously, keep it off the event loop
+                await asyncio.to_thread(example_batch_usage, agent)
+            else:
+                # The journeys are independent, so run them concurrently; total
+                # time is that of the slowest journey rather than the sum.
+                results = await asyncio.gather(
+                    example_basic_usage(agent),
+                    example_primary_care_usage(agent),
+                )
+                if combined:
+                    agent.save_combined_jsonl(results)
+        finally:
+            # Close the async client even if an example fails
+            await agent.aclose()
 
     except Exception as e:
         print(f"\n❌ Error running example: {e}")
-        import traceback
-
         traceback.print_exc()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,3 +1,5 @@
+import importlib
+
 from .types import (
     FHIRPatientData,
     PatientJourney,
@@ -6,12 +8,6 @@ from .types import (
     US_CORE_STU_TO_URL,
 )
 from .agents.journey_to_fhir import journey_to_fhir
-from .agents.ai_journey_to_fhir import (
-    AIJourneyToFHIR,
-    generate_fhir_from_journey,
-    GenerationResult,
-    GenerationPlan,
-)
 from .utils.fhir_validator import (
     FHIRValidator,
     validate_fhir_resource,
@@ -34,8 +30,11 @@ __all__ = [
     "journey_to_fhir",
     "AIJourneyToFHIR",
     "generate_fhir_from_journey",
+    "agenerate_fhir_from_journey",
+    "generate_fhir_from_journeys_batch",
     "GenerationResult",
     "GenerationPlan",
+    "TokenUsage",
     "FHIRValidator",
     "validate_fhir_resource",
     "ValidationResult",
@@ -47,3 +46,27 @@ __all__ = [
     "USCoreSTU",
     "US_CORE_STU_TO_URL",
 ]
+
+# The AI agent imports the OpenAI SDK, which dominates the package's import
+# time; it is only loaded when one of its names is first accessed.
+_LAZY_EXPORTS = {
+    name: ".agents.ai_journey_to_fhir"
+    for name in (
+        "AIJourneyToFHIR",
+        "generate_fhir_from_journey",
+        "agenerate_fhir_from_journey",
+        "generate_fhir_from_journeys_batch",
+        "GenerationResult",
+        "GenerationPlan",
+        "TokenUsage",
+    )
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
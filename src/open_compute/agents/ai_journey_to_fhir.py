@@ -6,16 +6,25 @@ that represent a complete patient journey, with validation and iterative
 refinement.
 """
 
+import hashlib
 import json
 import os
+import re
 import asyncio
 import uuid
 import time
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Literal
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Any, Iterable, List, Optional, Literal, Tuple
 
 try:
-    from openai import OpenAI, AsyncOpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient
 except ImportError:
     raise ImportError(
         "openai is required for AI-powered FHIR generation. "
@@ -28,6 +37,149 @@ from ..utils.fhir_schema_loader import get_schema_loader
 from ..utils.fhir_data_loader import get_data_loader
 
 
+# Every request asks for a JSON object; the SDK only reads this dict
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Resource types most plans contain; their validation models are loaded while
+# the planning request is in flight
+_COMMON_RESOURCE_TYPES = (
+    "Patient",
+    "Encounter",
+    "Condition",
+    "Observation",
+    "MedicationRequest",
+    "Procedure",
+)
+
+
+@lru_cache(maxsize=1)
+def _get_shared_http_client() -> DefaultHttpxClient:
+    """
+    Get the HTTP connection pool shared by all synchronous LLM clients.
+
+    A process that creates several agents (e.g. one per
+    generate_fhir_from_journey call) then reuses open connections instead of
+    paying a new TCP and TLS handshake per agent. Async clients keep their
+    own pool, since httpx async connections are tied to the event loop that
+    opened them.
+    """
+    return DefaultHttpxClient()
+
+
+class _ResourceArrayStream:
+    """
+    Incrementally extract the elements of a streamed {"resources": [...]} response.
+
+    Text is fed as it arrives; every element of the array is returned as
+    soon as its closing character has been seen. Each character is scanned
+    once, and an element is parsed only when it is complete. Elements that
+    are not valid JSON come back as None, so positions stay aligned with the
+    requested specs.
+    """
+
+    _ARRAY_START = re.compile(r'"resources"\s*:\s*\[')
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None  # Scan position, None until the array starts
+        self._start: Optional[int] = None  # Start of the element being scanned
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add streamed text and return the array elements it completed.
+
+        Args:
+            text: Next piece of the response content
+
+        Returns:
+            Parsed elements completed by this text, in order
+        """
+        self._buffer += text
+        if self._pos is None:
+            match = self._ARRAY_START.search(self._buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        elements = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer) and not self.done:
+            char = buffer[i]
+            if self._start is None:
+                # Between elements
+                if char == "]":
+                    self.done = True
+                elif not char.isspace() and char != ",":
+                    self._start = i
+                    continue
+                i += 1
+                continue
+
+            end = None
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        end = i + 1
+            elif self._depth == 0 and i > self._start and (char in ",]" or char.isspace()):
+                # End of a bare scalar; the delimiter is scanned again
+                end = i
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    end = i + 1
+
+            if end is None:
+                i += 1
+                continue
+            try:
+                elements.append(json.loads(buffer[self._start:end]))
+            except json.JSONDecodeError:
+                elements.append(None)
+            self._start = None
+            i = end
+
+        # Drop consumed text, keeping only the element still being scanned
+        keep = i if self._start is None else self._start
+        self._buffer = buffer[keep:]
+        self._pos = i - keep
+        if self._start is not None:
+            self._start = 0
+        return elements
+
+
+@dataclass
+class TokenUsage:
+    """Token counts reported by the LLM provider."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens that were served from the prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+# Usage of the journey being generated in the current context; asyncio
+# tasks inherit it, so concurrent journeys each count only their own calls
+_journey_usage: ContextVar[Optional[TokenUsage]] = ContextVar(
+    "_journey_usage", default=None)
+
+
 @dataclass
 class GenerationPlan:
     """Plan for generating FHIR resources."""
@@ -47,6 +199,8 @@ class GenerationResult:
     iterations: int = 0
     errors: List[str] = field(default_factory=list)
     planning_details: Optional[GenerationPlan] = None
+    saved_path: Optional[str] = None  # Directory the bundle was auto-saved to
+    usage: TokenUsage = field(default_factory=TokenUsage)
 
 
 class AIJourneyToFHIR:
@@ -59,6 +213,12 @@ class AIJourneyToFHIR:
     3. Validate each resource
     4. Check if the journey is complete or more resources are needed
     5. Iterate until success or max iterations reached
+
+    The agent keeps the parsed FHIR schema and enhanced context (valuesets,
+    profiles, search parameters) for its whole lifetime. When converting
+    several journeys, create one agent and call generate_from_journey on it
+    for each journey rather than calling generate_fhir_from_journey, which
+    builds a new agent on every call.
     """
 
     def __init__(
@@ -73,6 +233,16 @@ class AIJourneyToFHIR:
         parallel_generation: bool = True,
         use_enhanced_context: bool = True,
         llm_provider: Optional[str] = None,
+        auto_save: bool = True,
+        save_directory: str = "output",
+        pretty_json: bool = False,
+        max_concurrent_requests: int = 10,
+        requests_per_minute: Optional[int] = None,
+        max_api_retries: int = 3,
+        resources_per_request: int = 1,
+        stream_responses: bool = False,
+        trust_plan: bool = False,
+        cache_directory: Optional[str] = None,
     ):
         """
         Initialize the AI agent.
@@ -88,6 +258,23 @@ class AIJourneyToFHIR:
             parallel_generation: Use parallel generation for faster results (recommended)
             use_enhanced_context: Use enhanced context with valuesets, profiles, etc. (recommended)
             llm_provider: LLM provider to use ("openai" or "groq", defaults to LLM_PROVIDER env var or "openai")
+            auto_save: Save generated bundles to save_directory/firstname_lastname/
+            save_directory: Base directory for auto-saved bundles
+            pretty_json: Indent the saved patient_bundle.json for reading. By default it is written compact,
+                which is several times faster to serialize and about half the size for large bundles
+            max_concurrent_requests: Maximum number of LLM requests in flight at once
+            requests_per_minute: Optional cap on LLM requests started per minute (e.g. the provider's RPM
+                limit); requests are spaced evenly instead of bursting into 429 retries
+            max_api_retries: Retries (with exponential backoff) for rate-limited, timed-out or failed API requests
+            resources_per_request: Planned resources generated per LLM request in parallel mode (1 = one request per resource)
+            stream_responses: Stream grouped generation responses (resources_per_request > 1) and validate each
+                resource as soon as it has arrived instead of after the whole response. The provider must
+                support streaming in JSON mode
+            trust_plan: Skip the LLM completeness check when every planned resource was generated and validated
+                in the first iteration, saving one round trip per journey. The check can catch resources the
+                plan missed, so this trades coverage for latency
+            cache_directory: Optional directory for an on-disk cache of LLM responses. Re-running the same
+                journey with the same model replays the cached responses instead of calling the API (useful in development)
         """
         # Determine the LLM provider
         self.llm_provider = (llm_provider or os.getenv(
@@ -108,12 +295,15 @@ class AIJourneyToFHIR:
             # Initialize Groq clients (OpenAI-compatible with custom base URL)
             self.client = OpenAI(
                 api_key=self.api_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            self.async_client = AsyncOpenAI(
-                api_key=self.api_key,
-                base_url="https://api.groq.com/openai/v1"
+                base_url="https://api.groq.com/openai/v1",
+                max_retries=max_api_retries,
+                http_client=_get_shared_http_client(),
             )
+            self._async_client_options = {
+                "api_key": self.api_key,
+                "base_url": "https://api.groq.com/openai/v1",
+                "max_retries": max_api_retries,
+            }
         else:  # openai
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if not self.api_key:
@@ -121,8 +311,11 @@ class AIJourneyToFHIR:
                     "OpenAI API key must be provided or set in OPENAI_API_KEY env var when using OpenAI provider"
                 )
             # Initialize OpenAI clients
-            self.client = OpenAI(api_key=self.api_key)
-            self.async_client = AsyncOpenAI(api_key=self.api_key)
+            self.client = OpenAI(
+                api_key=self.api_key, max_retries=max_api_retries,
+                http_client=_get_shared_http_client())
+            self._async_client_options = {
+                "api_key": self.api_key, "max_retries": max_api_retries}
 
         self.model = model
         self.fhir_version = fhir_version
@@ -130,6 +323,37 @@ class AIJourneyToFHIR:
         self.max_fix_retries = max_fix_retries
         self.validator = FHIRValidator(version=fhir_version)
 
+        # System messages only depend on the agent's settings, build them once
+        self._system_messages = {
+            "planning": {
+                "role": "system",
+                "content": "You are a FHIR expert who creates comprehensive plans for generating FHIR resources from patient journeys.",
+            },
+            "generation": {
+                "role": "system",
+                "content": f"You are a FHIR expert who generates valid FHIR {fhir_version} resources. You always return valid JSON. You ONLY use data explicitly mentioned in the provided patient journey - you never add information not stated in the journey.",
+            },
+            "fix": {
+                "role": "system",
+                "content": f"You are a FHIR expert who fixes validation errors in FHIR {fhir_version} resources. You always return valid, corrected JSON.",
+            },
+            "completeness": {
+                "role": "system",
+                "content": "You are a FHIR expert who assesses completeness of FHIR resource sets.",
+            },
+        }
+
+        # Reference blocks per resource type (see _get_resource_context);
+        # kept on the instance so a cache does not outlive the agent
+        self._resource_contexts: Dict[str, str] = {}
+
+        # Tokens used over the agent's lifetime (see _record_usage)
+        self.usage = TokenUsage()
+
+        # Formatted journey text for journeys currently being generated,
+        # keyed by id() (see _format_journey_for_prompt)
+        self._journey_descriptions: Dict[int, Tuple[PatientJourney, str]] = {}
+
         # Load FHIR data - use enhanced loader if enabled, fallback to basic schema loader
         self.use_enhanced_context = use_enhanced_context
         if use_enhanced_context:
@@ -141,6 +365,232 @@ class AIJourneyToFHIR:
             self.schema_loader = get_schema_loader(fhir_schema_path)
 
         self.parallel_generation = parallel_generation
+        self.resources_per_request = resources_per_request
+        self.stream_responses = stream_responses
+        self.trust_plan = trust_plan
+        self.cache_directory = cache_directory
+        self.auto_save = auto_save
+        self.save_directory = save_directory
+        self.pretty_json = pretty_json
+
+        # Bound on concurrent async requests; the semaphore is created per
+        # event loop because asyncio primitives cannot be shared across loops
+        self.max_concurrent_requests = max_concurrent_requests
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._request_semaphore_loop = None
+
+        # Steady-state request rate; _next_request_time is the earliest
+        # (monotonic) time the next request may start
+        self.requests_per_minute = requests_per_minute
+        self._next_request_time = 0.0
+
+        # The async client (and its connection pool) is likewise created per
+        # event loop, see _get_async_client
+        self.async_client: Optional[AsyncOpenAI] = None
+        self._async_client_loop = None
+
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """Get the request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._request_semaphore is None or self._request_semaphore_loop is not loop:
+            self._request_semaphore = asyncio.Semaphore(
+                self.max_concurrent_requests)
+            self._request_semaphore_loop = loop
+        return self._request_semaphore
+
+    async def _wait_for_request_slot(self):
+        """Wait until the next request may start under requests_per_minute."""
+        if not self.requests_per_minute:
+            return
+
+        now = time.monotonic()
+        start = max(now, self._next_request_time)
+        # Reserve the slot before sleeping, so concurrent callers queue up
+        self._next_request_time = start + 60.0 / self.requests_per_minute
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """
+        Get the async client for the running event loop.
+
+        All requests in a loop share one connection pool, sized to
+        max_concurrent_requests so every in-flight request can keep its
+        connection alive for the next one. httpx connections cannot outlive
+        the loop that opened them, so a new loop gets a new client.
+        """
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or self._async_client_loop is not loop:
+            pool_size = max(1, self.max_concurrent_requests)
+            self.async_client = AsyncOpenAI(
+                **self._async_client_options,
+                http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size)),
+            )
+            self._async_client_loop = loop
+        return self.async_client
+
+    async def aclose(self):
+        """Close the async client's connections; call before the event loop ends."""
+        client, self.async_client = self.async_client, None
+        if client is not None:
+            await client.close()
+
+    def _record_usage(self, response):
+        """
+        Add a response's token usage to the agent's and the current journey's totals.
+
+        Providers that do not report usage (or cached tokens) are skipped.
+        """
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+
+        for totals in (self.usage, _journey_usage.get()):
+            if totals is None:
+                continue
+            totals.prompt_tokens += prompt_tokens
+            if isinstance(completion_tokens, int):
+                totals.completion_tokens += completion_tokens
+            if isinstance(cached_tokens, int):
+                totals.cached_tokens += cached_tokens
+
+    async def _chat_completion_async(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Make a JSON-mode chat completion request through the async client.
+
+        At most max_concurrent_requests calls are in flight at once, and with
+        requests_per_minute set, calls start no faster than that rate, so large
+        parallel batches do not trip provider rate limits. Rate-limit, timeout
+        and connection errors are retried by the client with exponential
+        backoff (max_api_retries).
+
+        Args:
+            messages: Chat messages to send
+
+        Returns:
+            Content of the model's response
+        """
+        cache_key = self._response_cache_key(messages)
+        cached = self._read_response_cache(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._get_request_semaphore():
+            client = self._get_async_client()
+            await self._wait_for_request_slot()
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                response_format=_JSON_RESPONSE_FORMAT,
+            )
+        self._record_usage(response)
+        content = response.choices[0].message.content
+
+        self._write_response_cache(cache_key, content)
+        return content
+
+    async def _chat_completion_stream_async(
+        self, messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of _chat_completion_async.
+
+        Yields the response content piece by piece as the model produces it.
+        The full content is cached once the stream has ended, and a cached
+        response is yielded in one piece.
+
+        Args:
+            messages: Chat messages to send
+
+        Yields:
+            Consecutive pieces of the model's response content
+        """
+        cache_key = self._response_cache_key(messages)
+        cached = self._read_response_cache(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        async with self._get_request_semaphore():
+            client = self._get_async_client()
+            await self._wait_for_request_slot()
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                response_format=_JSON_RESPONSE_FORMAT,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    # The final chunk carries the request's usage and no choices
+                    self._record_usage(chunk)
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        self._write_response_cache(cache_key, "".join(parts))
+
+    def _response_cache_key(
+        self, messages: List[Dict[str, str]], kind: str = "completion"
+    ) -> Optional[str]:
+        """
+        Build the response cache key for a request, or None if caching is off.
+
+        Args:
+            messages: Chat messages of the request
+            kind: What is cached under the key ("completion" or "plan")
+
+        Returns:
+            Hex digest identifying the request
+        """
+        if not self.cache_directory:
+            return None
+
+        payload = json.dumps(
+            {
+                "kind": kind,
+                "provider": self.llm_provider,
+                "model": self.model,
+                "fhir_version": self.fhir_version,
+                "messages": messages,
+            },
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _read_response_cache(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return the cached content for a key, or None on a miss."""
+        if not cache_key:
+            return None
+
+        cache_file = Path(self.cache_directory) / f"{cache_key}.json"
+        try:
+            return cache_file.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_response_cache(self, cache_key: Optional[str], content: str):
+        """Store content under a cache key. Only valid JSON is cached."""
+        if not cache_key:
+            return
+
+        try:
+            json.loads(content)
+            cache_dir = Path(self.cache_directory)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_file(cache_dir / f"{cache_key}.json",
+                             content.encode("utf-8"))
+        except (TypeError, ValueError, OSError) as e:
+            print(f"Warning: Could not cache LLM response: {e}")
 
     def _run_async_safely(self, coroutine):
         """
@@ -160,8 +610,15 @@ class AIJourneyToFHIR:
             nest_asyncio.apply()
             return asyncio.run(coroutine)
         except RuntimeError:
-            # No event loop is running, we can safely use asyncio.run
-            return asyncio.run(coroutine)
+            # No event loop is running, we can safely use asyncio.run; the
+            # loop is ours, so close its connections before it ends
+            async def run_and_close():
+                try:
+                    return await coroutine
+                finally:
+                    await self.aclose()
+
+            return asyncio.run(run_and_close())
 
     def generate_from_journey(
         self, journey: PatientJourney, patient_context: Optional[str] = None
@@ -169,6 +626,26 @@ class AIJourneyToFHIR:
         """
         Generate FHIR resources from a patient journey.
 
+        Args:
+            journey: PatientJourney to convert to FHIR
+            patient_context: Optional additional context about the patient
+
+        Returns:
+            GenerationResult with generated resources and validation status
+        """
+        return self._run_async_safely(
+            self.agenerate_from_journey(journey, patient_context)
+        )
+
+    async def agenerate_from_journey(
+        self, journey: PatientJourney, patient_context: Optional[str] = None
+    ) -> GenerationResult:
+        """
+        Async version of generate_from_journey.
+
+        All LLM calls go through the async client, and independent resource
+        generations and fixes within an iteration are awaited concurrently.
+
         Args:
             journey: PatientJourney to convert to FHIR
             patient_context: Optional additional context about the patient
@@ -189,9 +666,69 @@ class AIJourneyToFHIR:
             f"Parallel Generation: {'Enabled' if self.parallel_generation else 'Disabled'}")
         print("=" * 70)
 
-        # Step 1: Create a generation plan
+        # The context is repeated in every prompt, so trim it once up front
+        patient_context = self._compact_context(patient_context)
+
+        # Likewise the journey text: format it once for this run
+        usage = TokenUsage()
+        usage_token = _journey_usage.set(usage)
+        try:
+            with self._journey_descriptions_for([journey]):
+                result = await self._generate_from_plan_async(journey, patient_context)
+        finally:
+            _journey_usage.reset(usage_token)
+        result.usage = usage
+        return result
+
+    @contextmanager
+    def _journey_descriptions_for(self, journeys: List[PatientJourney]):
+        """
+        Format each journey's prompt text once for the duration of a run.
+
+        Every planning, generation and fix prompt of the run then reuses the
+        stored text (see _format_journey_for_prompt). Entries added here are
+        dropped on exit; journeys already registered by an enclosing run are
+        left to that run.
+
+        Args:
+            journeys: Journeys about to be generated
+        """
+        owned_keys = []
+        for journey in journeys:
+            journey_key = id(journey)
+            if journey_key not in self._journey_descriptions:
+                self._journey_descriptions[journey_key] = (
+                    journey, self._format_journey_for_prompt(journey))
+                owned_keys.append(journey_key)
+        try:
+            yield
+        finally:
+            for journey_key in owned_keys:
+                self._journey_descriptions.pop(journey_key, None)
+
+    async def _generate_from_plan_async(
+        self, journey: PatientJourney, patient_context: Optional[str] = None
+    ) -> GenerationResult:
+        """
+        Plan and generate the resources for a journey (body of agenerate_from_journey).
+
+        Args:
+            journey: PatientJourney to convert to FHIR
+            patient_context: Compacted additional context about the patient
+
+        Returns:
+            GenerationResult with generated resources and validation status
+        """
+        # Step 1: Create a generation plan. Meanwhile a worker thread loads
+        # the validation models, so the first validation does not pay for it.
         print("\n📋 STEP 1: Creating Generation Plan...")
-        plan = self._create_generation_plan(journey, patient_context)
+        warmup = asyncio.ensure_future(asyncio.to_thread(
+            self.validator.warmup, _COMMON_RESOURCE_TYPES))
+        try:
+            plan = await self._create_generation_plan_async(
+                journey, patient_context)
+        finally:
+            await warmup
 
         if not plan.resources_to_generate:
             print("❌ Failed to create generation plan")
@@ -206,14 +743,176 @@ class AIJourneyToFHIR:
 
         print(f"  Resources to generate: {plan.resources_to_generate}")
 
-        # Step 2: Generate resources iteratively with validation
+        # Step 2: Generate resources iteratively with validation. Planned
+        # types beyond the common ones have their models loaded while the
+        # first generation requests are in flight.
         print(
             f"\n⚙️  STEP 2: Generating Resources (max {self.max_iterations} iterations)...")
-        result = self._iterative_generation(journey, plan, patient_context)
+        planned_types = sorted({
+            spec.get("resourceType") for spec in plan.resources_to_generate
+            if spec.get("resourceType")
+        } - set(_COMMON_RESOURCE_TYPES))
+        warmup = asyncio.ensure_future(asyncio.to_thread(
+            self.validator.warmup, planned_types)) if planned_types else None
+        try:
+            result = await self._iterative_generation_async(
+                journey, plan, patient_context)
+        finally:
+            if warmup is not None:
+                await warmup
+
+        if self.auto_save and result.fhir_data:
+            # Encoding and writing the bundle is blocking work; doing it in a
+            # thread lets other journeys' requests progress in the meantime
+            result.saved_path = await asyncio.to_thread(
+                self._save_bundle, result.fhir_data, journey)
 
         return result
 
-    def _create_generation_plan(
+    def generate_from_journeys_batch(
+        self,
+        journeys: List[PatientJourney],
+        patient_contexts: Optional[List[Optional[str]]] = None,
+        poll_interval: float = 30.0,
+        combined_save: bool = False,
+    ) -> List[GenerationResult]:
+        """
+        Generate FHIR resources for many journeys through the provider's Batch API.
+
+        Planning and resource generation requests for every journey are each
+        submitted as a single batch job, which is billed at a discount and runs
+        against a separate rate limit pool. Resources that fail validation are
+        fixed with regular (realtime) calls. Batch jobs can take up to 24 hours,
+        so this is meant for non-interactive bulk runs.
+
+        Args:
+            journeys: PatientJourneys to convert to FHIR
+            patient_contexts: Optional additional context per journey (same order as journeys)
+            poll_interval: Seconds to wait between batch status checks
+            combined_save: With auto_save, write every journey's resources to a
+                single save_directory/all_patients.jsonl instead of one folder per patient
+
+        Returns:
+            List of GenerationResult, in the same order as journeys
+        """
+        patient_contexts = patient_contexts or [None] * len(journeys)
+        if len(patient_contexts) != len(journeys):
+            raise ValueError(
+                "patient_contexts must have the same length as journeys")
+        patient_contexts = [self._compact_context(context)
+                            for context in patient_contexts]
+
+        print("\n" + "=" * 70)
+        print("🚀 STARTING BATCH FHIR GENERATION")
+        print("=" * 70)
+        print(f"Journeys: {len(journeys)}")
+        print(f"LLM Provider: {self.llm_provider.upper()}")
+        print(f"Model: {self.model}")
+        print(f"FHIR Version: {self.fhir_version}")
+        print("=" * 70)
+
+        # Each journey's text goes into its planning, generation and fix prompts
+        with self._journey_descriptions_for(journeys):
+            return self._generate_batch(
+                journeys, patient_contexts, poll_interval, combined_save)
+
+    def _generate_batch(
+        self,
+        journeys: List[PatientJourney],
+        patient_contexts: List[Optional[str]],
+        poll_interval: float,
+        combined_save: bool,
+    ) -> List[GenerationResult]:
+        """
+        Run the batch jobs and validation (body of generate_from_journeys_batch).
+
+        Args:
+            journeys: PatientJourneys to convert to FHIR
+            patient_contexts: Compacted additional context per journey
+            poll_interval: Seconds to wait between batch status checks
+            combined_save: Save all resources to one JSONL file
+
+        Returns:
+            List of GenerationResult, in the same order as journeys
+        """
+        # Step 1: One batch job with a planning request per journey
+        print("\n📋 STEP 1: Submitting planning batch...")
+        plan_outputs = self._run_batch_job([
+            self._build_batch_request(
+                f"plan-{idx}",
+                self._build_planning_messages(journey, context),
+            )
+            for idx, (journey, context) in enumerate(zip(journeys, patient_contexts))
+        ], poll_interval)
+
+        plans = []
+        for idx in range(len(journeys)):
+            plan_data = plan_outputs.get(f"plan-{idx}")
+            if not isinstance(plan_data, dict):
+                plans.append(GenerationPlan())
+                continue
+            try:
+                plans.append(self._parse_generation_plan(plan_data))
+            except Exception as e:
+                # One malformed plan must not abort the other journeys
+                print(f"Error creating generation plan for journey {idx}: {e}")
+                plans.append(GenerationPlan())
+
+        # Step 2: One batch job with a generation request per planned resource
+        print("\n⚙️  STEP 2: Submitting resource generation batch...")
+        generation_requests = []
+        for idx, (journey, context, plan) in enumerate(zip(journeys, patient_contexts, plans)):
+            for res_idx, resource_spec in enumerate(plan.resources_to_generate):
+                generation_requests.append(self._build_batch_request(
+                    f"gen-{idx}-{res_idx}",
+                    self._build_generation_messages(
+                        resource_spec, journey, [], context, plan.resource_id_map
+                    ),
+                ))
+        generation_outputs = self._run_batch_job(
+            generation_requests, poll_interval) if generation_requests else {}
+
+        # Step 3: Validate (and fix) each journey's resources. Fixes are
+        # realtime calls; all journeys share one event loop and client, so
+        # connections are reused and fixes for different journeys overlap.
+        print("\n📝 STEP 3: Validating batch results...")
+
+        async def validate_journey(idx, journey, context, plan):
+            if not plan.resources_to_generate:
+                return GenerationResult(
+                    success=False,
+                    errors=["Failed to create a generation plan"],
+                )
+
+            # Outputs that are missing or not a JSON object count as not generated
+            generated_resources = [
+                self._finalize_generated_resource(
+                    generation_outputs[f"gen-{idx}-{res_idx}"], resource_spec)
+                if isinstance(generation_outputs.get(f"gen-{idx}-{res_idx}"), dict) else None
+                for res_idx, resource_spec in enumerate(plan.resources_to_generate)
+            ]
+            return await self._validate_batch_resources_async(
+                journey, context, plan, generated_resources)
+
+        async def validate_all():
+            return await asyncio.gather(*[
+                validate_journey(idx, journey, context, plan)
+                for idx, (journey, context, plan) in enumerate(zip(journeys, patient_contexts, plans))
+            ])
+
+        results = self._run_async_safely(validate_all())
+        if self.auto_save and not combined_save:
+            for journey, result in zip(journeys, results):
+                if result.fhir_data:
+                    result.saved_path = self._save_bundle(
+                        result.fhir_data, journey)
+
+        if self.auto_save and combined_save:
+            self.save_combined_jsonl(results)
+
+        return results
+
+    async def _create_generation_plan_async(
         self, journey: PatientJourney, patient_context: Optional[str] = None
     ) -> GenerationPlan:
         """
@@ -226,6 +925,43 @@ class AIJourneyToFHIR:
         Returns:
             GenerationPlan with resources to generate
         """
+        try:
+            messages = self._build_planning_messages(journey, patient_context)
+
+            # The parsed plan (with its assigned IDs) is cached rather than
+            # the raw response, so later prompts referencing those IDs are
+            # identical on a re-run and hit the response cache too.
+            cache_key = self._response_cache_key(messages, kind="plan")
+            cached = self._read_response_cache(cache_key)
+            if cached is not None:
+                print("♻️  Reusing cached generation plan")
+                return GenerationPlan(**json.loads(cached))
+
+            content = await self._chat_completion_async(messages)
+
+            plan_data = json.loads(content)
+            plan = self._parse_generation_plan(plan_data)
+            if plan.resources_to_generate:
+                self._write_response_cache(cache_key, json.dumps(asdict(plan), ensure_ascii=False))
+            return plan
+
+        except Exception as e:
+            print(f"Error creating generation plan: {e}")
+            return GenerationPlan()
+
+    def _build_planning_messages(
+        self, journey: PatientJourney, patient_context: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages used to request a generation plan.
+
+        Args:
+            journey: PatientJourney to analyze
+            patient_context: Optional additional context
+
+        Returns:
+            List of chat messages (system and user)
+        """
         # Build the prompt for planning
         journey_description = self._format_journey_for_prompt(journey)
 
@@ -242,6 +978,7 @@ Your task:
    - resourceType (e.g., Patient, Encounter, Condition, Observation, Procedure, MedicationRequest, etc.)
    - A brief description of what the resource should contain
    - Key data points from the journey that should be included
+   - Optionally, "depends_on": resourceTypes whose generated content this resource must see first (leave it out when assigned IDs are enough to reference them)
 
 CRITICAL RULES - READ CAREFULLY:
 - ALWAYS include administrative/structural resources: Patient, Encounter, Practitioner, Location, Organization (even if not explicitly mentioned in the journey)
@@ -302,49 +1039,91 @@ Return your response as a JSON object with this structure:
 
 Remember: Your rationale should explain how each clinical resource is directly mentioned in the journey. Be extremely conservative - only include what is explicitly stated."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a FHIR expert who creates comprehensive plans for generating FHIR resources from patient journeys.",
-                    },
-                    {"role": "user", "content": planning_prompt},
-                ],
-
-                response_format={"type": "json_object"},
-            )
+        return [
+            self._system_messages["planning"],
+            {"role": "user", "content": planning_prompt},
+        ]
 
-            plan_data = json.loads(response.choices[0].message.content)
-            resources = plan_data.get("resources", [])
-
-            # Generate UUIDs for each planned resource
-            resource_id_map = {}
-            for resource_spec in resources:
-                resource_type = resource_spec.get("resourceType")
-                if resource_type:
-                    # Generate a unique UUID for this resource
-                    resource_uuid = str(uuid.uuid4())
-                    resource_id_map[resource_type] = resource_uuid
-                    # Add the UUID to the resource spec for easy reference
-                    resource_spec["assigned_id"] = resource_uuid
-
-            print(f"\n🔑 Generated Resource IDs:")
-            for resource_type, resource_id in resource_id_map.items():
-                print(f"   {resource_type}: {resource_id}")
-
-            return GenerationPlan(
-                resources_to_generate=resources,
-                rationale=plan_data.get("rationale", ""),
-                resource_id_map=resource_id_map,
-            )
+    def _parse_generation_plan(self, plan_data: Dict[str, Any]) -> GenerationPlan:
+        """
+        Turn the planner's JSON response into a GenerationPlan with assigned IDs.
 
-        except Exception as e:
-            print(f"Error creating generation plan: {e}")
-            return GenerationPlan()
+        Args:
+            plan_data: Parsed JSON returned by the planning prompt
+
+        Returns:
+            GenerationPlan with a UUID assigned to each planned resource
+        """
+        resources = self._order_by_dependencies(plan_data.get("resources", []))
+
+        # Generate UUIDs for each planned resource
+        resource_id_map = {}
+        for resource_spec in resources:
+            resource_type = resource_spec.get("resourceType")
+            if resource_type:
+                # Generate a unique UUID for this resource
+                resource_uuid = str(uuid.uuid4())
+                resource_id_map[resource_type] = resource_uuid
+                # Add the UUID to the resource spec for easy reference
+                resource_spec["assigned_id"] = resource_uuid
+
+        print(f"\n🔑 Generated Resource IDs:")
+        for resource_type, resource_id in resource_id_map.items():
+            print(f"   {resource_type}: {resource_id}")
+
+        return GenerationPlan(
+            resources_to_generate=resources,
+            rationale=plan_data.get("rationale", ""),
+            resource_id_map=resource_id_map,
+        )
+
+    @staticmethod
+    def _order_by_dependencies(resource_specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Order planned resources so that every spec follows the ones it depends on.
+
+        The sort is stable: specs keep the planner's order unless a
+        "depends_on" entry requires moving them. A single type given as a
+        string is treated as a one-item list, and other non-list values are
+        ignored. Dependencies on types that are not part of the plan are
+        dropped, and specs caught in a cycle are kept in their original order.
+
+        Args:
+            resource_specs: Resource specs from the planner
+
+        Returns:
+            Reordered list of the same resource specs
+        """
+        planned_types = {spec.get("resourceType") for spec in resource_specs}
+        for spec in resource_specs:
+            deps = spec.get("depends_on")
+            if deps:
+                # The planner may give a single type as a string
+                deps = [deps] if isinstance(deps, str) else deps if isinstance(deps, list) else []
+                spec["depends_on"] = [
+                    dep for dep in deps
+                    if dep in planned_types and dep != spec.get("resourceType")
+                ]
+
+        ordered: List[Dict[str, Any]] = []
+        remaining = list(resource_specs)
+        while remaining:
+            pending_types = {spec.get("resourceType") for spec in remaining}
+            ready = [
+                spec for spec in remaining
+                if not pending_types.intersection(spec.get("depends_on") or [])
+            ]
+            if not ready:
+                # Dependency cycle: keep the rest as the planner listed it
+                ordered.extend(remaining)
+                break
+            ordered.extend(ready)
+            ready_ids = {id(spec) for spec in ready}
+            remaining = [spec for spec in remaining if id(spec) not in ready_ids]
+
+        return ordered
 
-    def _iterative_generation(
+    async def _iterative_generation_async(
         self,
         journey: PatientJourney,
         initial_plan: GenerationPlan,
@@ -353,6 +1132,9 @@ Remember: Your rationale should explain how each clinical resource is directly m
         """
         Generate resources iteratively with validation and completeness checking.
 
+        Within each iteration, resources are generated (and invalid ones fixed)
+        concurrently when parallel generation is enabled.
+
         Args:
             journey: PatientJourney to convert
             initial_plan: Initial generation plan
@@ -368,6 +1150,8 @@ Remember: Your rationale should explain how each clinical resource is directly m
 
         resources_to_generate = initial_plan.resources_to_generate.copy()
         journey_description = self._format_journey_for_prompt(journey)
+        # (resources the last completeness check saw, its result)
+        previous_check = None
 
         while current_iteration < self.max_iterations:
             current_iteration += 1
@@ -376,94 +1160,69 @@ Remember: Your rationale should explain how each clinical resource is directly m
 
             # Generate resources from current list
             if self.parallel_generation and len(resources_to_generate) > 1:
-                # Parallel generation for speed
+                # Parallel generation for speed. Each resource runs its own
+                # generate -> validate -> fix pipeline, so a slow generation
+                # never holds up fixing the resources that finished first.
                 print(
                     f"\n🔄 Generating {len(resources_to_generate)} resources in parallel...")
                 print("   📡 Making concurrent API calls...")
 
-                start_time = time.time()
-                batch_results = self._run_async_safely(
-                    self._generate_resources_parallel(
-                        resources_to_generate, journey, generated_resources, patient_context, initial_plan.resource_id_map
-                    )
+                start_time = time.perf_counter()
+                pipeline_results = await self._generate_resources_pipelined(
+                    resources_to_generate, journey, generated_resources, patient_context, initial_plan.resource_id_map
                 )
-                elapsed = time.time() - start_time
+                elapsed = time.perf_counter() - start_time
                 print(f"   ✓ All API calls completed in {elapsed:.1f}s")
 
-                # Process parallel results
+                # Process pipeline results in plan order
                 print(
-                    f"\n📝 Processing and validating {len(batch_results)} generated resources...")
-
-                # First pass: validate all resources
-                validation_data = []
-                for idx, (resource_spec, generated_resource) in enumerate(zip(resources_to_generate, batch_results)):
+                    f"\n📝 Processing {len(pipeline_results)} generated resources...")
+                for idx, (resource_spec, outcome) in enumerate(zip(resources_to_generate, pipeline_results)):
                     resource_type = resource_spec.get("resourceType")
                     print(
                         f"  [{idx+1}/{len(resources_to_generate)}] {resource_type}: ", end="")
 
-                    if not generated_resource:
+                    if isinstance(outcome, Exception):
+                        print(f"❌ Generation failed ({outcome})")
+                        errors.append(
+                            f"Failed to generate {resource_type}: {outcome}")
+                        continue
+
+                    if not outcome["resource"]:
                         print("❌ Generation failed")
                         errors.append(f"Failed to generate {resource_type}")
                         continue
 
-                    # Validate the resource
-                    validation = self.validator.validate(generated_resource)
+                    validation = outcome["validation"]
                     validation_results.append(validation)
 
                     if validation.is_valid:
                         print("✓ Valid")
-                        generated_resources.append(generated_resource)
-                    else:
-                        print(f"✗ Invalid ({len(validation.errors)} errors)")
-                        validation_data.append({
-                            'resource': generated_resource,
-                            'validation': validation,
-                            'spec': resource_spec,
-                            'index': idx
-                        })
-
-                # Second pass: fix all invalid resources in parallel
-                if validation_data:
-                    print(
-                        f"\n🔧 Fixing {len(validation_data)} invalid resources in parallel...")
-                    print("   📡 Making concurrent fix API calls...")
+                        generated_resources.append(outcome["resource"])
+                        continue
 
-                    start_time = time.time()
-                    fix_results = self._run_async_safely(
-                        self._fix_resources_parallel(
-                            validation_data, journey, generated_resources, patient_context, initial_plan.resource_id_map
-                        )
-                    )
-                    elapsed = time.time() - start_time
-                    print(f"   ✓ All fix calls completed in {elapsed:.1f}s")
-
-                    # Process fix results
-                    print(f"\n📝 Validating fixed resources...")
-                    for idx, (val_data, fixed_resource) in enumerate(zip(validation_data, fix_results)):
-                        resource_type = val_data['spec'].get('resourceType')
-                        original_idx = val_data['index']
+                    fixed_resource = outcome["fixed_resource"]
+                    if not fixed_resource:
                         print(
-                            f"  [{original_idx+1}] {resource_type}: ", end="")
+                            f"✗ Invalid ({len(validation.errors)} errors), could not fix")
+                        errors.append(
+                            f"Validation failed for {resource_type}: {validation.errors}"
+                        )
+                        continue
 
-                        if fixed_resource:
-                            # Validate the fixed resource
-                            fixed_validation = self.validator.validate(
-                                fixed_resource)
-                            validation_results.append(fixed_validation)
+                    fixed_validation = outcome["fixed_validation"]
+                    validation_results.append(fixed_validation)
 
-                            if fixed_validation.is_valid:
-                                print("✓ Fixed successfully")
-                                generated_resources.append(fixed_resource)
-                            else:
-                                print(f"✗ Still invalid after fixes")
-                                errors.append(
-                                    f"Validation failed for {resource_type} after {self.max_fix_retries} attempts: {fixed_validation.errors}"
-                                )
-                        else:
-                            print(f"✗ Could not fix")
-                            errors.append(
-                                f"Validation failed for {resource_type}: {val_data['validation'].errors}"
-                            )
+                    if fixed_validation.is_valid:
+                        print(
+                            f"✗ Invalid ({len(validation.errors)} errors), ✓ fixed successfully")
+                        generated_resources.append(fixed_resource)
+                    else:
+                        print(
+                            f"✗ Invalid ({len(validation.errors)} errors), still invalid after fixes")
+                        errors.append(
+                            f"Validation failed for {resource_type} after {self.max_fix_retries} attempts: {fixed_validation.errors}"
+                        )
             else:
                 # Sequential generation (for single resource or when parallel disabled)
                 for resource_spec in resources_to_generate:
@@ -471,7 +1230,7 @@ Remember: Your rationale should explain how each clinical resource is directly m
                     print(f"Generating {resource_type}...")
 
                     # Generate the resource
-                    generated_resource = self._generate_single_resource(
+                    generated_resource = await self._generate_single_resource_async(
                         resource_spec, journey, generated_resources, patient_context, initial_plan.resource_id_map
                     )
 
@@ -493,7 +1252,7 @@ Remember: Your rationale should explain how each clinical resource is directly m
 
                         # Try to fix the resource
                         print(f"  → Attempting to fix {resource_type}...")
-                        fixed_resource = self._fix_invalid_resource(
+                        fixed_resource = await self._fix_invalid_resource_async(
                             generated_resource,
                             validation,
                             resource_spec,
@@ -527,9 +1286,23 @@ Remember: Your rationale should explain how each clinical resource is directly m
             # Check if we have a complete journey or need more resources
             print(f"\n🔍 Checking Journey Completeness...")
             print(f"   Current resources: {len(generated_resources)}")
-            completeness_check = self._check_completeness(
-                journey, generated_resources, journey_description, patient_context
-            )
+            if (self.trust_plan and current_iteration == 1 and not errors
+                    and len(generated_resources) == len(resources_to_generate)):
+                print("   ✓ Every planned resource is valid, skipping the LLM check")
+                completeness_check = {"is_complete": True}
+            else:
+                # The check only sees each resource's type and ID, so with
+                # nothing added since the last check it would get the same prompt
+                check_key = [(r.get("resourceType"), r.get("id"))
+                             for r in generated_resources]
+                if previous_check is not None and previous_check[0] == check_key:
+                    print("   ↺ No new resources since the last check, reusing its result")
+                    completeness_check = previous_check[1]
+                else:
+                    completeness_check = await self._check_completeness_async(
+                        journey, generated_resources, journey_description, patient_context
+                    )
+                    previous_check = (check_key, completeness_check)
 
             if completeness_check["is_complete"]:
                 print("   ✓ Journey is complete!")
@@ -617,13 +1390,13 @@ Remember: Your rationale should explain how each clinical resource is directly m
         for item in key_data:
             if isinstance(item, dict):
                 # Convert dict to string representation
-                formatted_items.append(json.dumps(item))
+                formatted_items.append(json.dumps(item, ensure_ascii=False))
             else:
                 formatted_items.append(str(item))
 
         return ', '.join(formatted_items)
 
-    def _generate_single_resource(
+    async def _generate_single_resource_async(
         self,
         resource_spec: Dict[str, Any],
         journey: PatientJourney,
@@ -645,112 +1418,175 @@ Remember: Your rationale should explain how each clinical resource is directly m
             Generated FHIR resource as dict, or None if generation failed
         """
         resource_type = resource_spec.get("resourceType")
-        description = resource_spec.get("description", "")
-        key_data = resource_spec.get("key_data", [])
-        assigned_id = resource_spec.get("assigned_id")  # Get pre-assigned UUID
 
-        journey_description = self._format_journey_for_prompt(journey)
-        existing_resources_summary = self._format_existing_resources(
-            existing_resources)
+        try:
+            content = await self._chat_completion_async(
+                self._build_generation_messages(
+                    resource_spec, journey, existing_resources, patient_context, resource_id_map
+                )
+            )
 
-        # Format resource ID map for prompt
-        id_map_text = self._format_resource_id_map(resource_id_map or {})
+            resource = json.loads(content)
+            return self._finalize_generated_resource(resource, resource_spec)
 
-        # Get FHIR context for this resource type - use enhanced if available
-        if self.use_enhanced_context and self.data_loader and self.data_loader.is_loaded():
-            schema_context = self.data_loader.format_enhanced_context_for_prompt(
-                resource_type)
-        else:
-            schema_context = self.schema_loader.format_schema_for_prompt(
-                resource_type)
+        except Exception as e:
+            print(f"  Error generating {resource_type}: {e}")
+            return None
 
-        # Get resource-specific guidance
-        resource_guidance = self._get_resource_specific_guidance(resource_type)
+    async def _generate_resource_group_async(
+        self,
+        resource_specs: List[Dict[str, Any]],
+        journey: PatientJourney,
+        existing_resources: List[Dict[str, Any]],
+        patient_context: Optional[str] = None,
+        resource_id_map: Optional[Dict[str, str]] = None,
+        on_resource: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Generate several FHIR resources with a single LLM request.
 
-        generation_prompt = f"""Generate a valid FHIR {self.fhir_version} {resource_type} resource.
+        With stream_responses, resources are taken from the response while it
+        is still being generated, so on_resource sees the first ones before
+        the model has written the rest.
 
-Patient Journey:
-{journey_description}
+        Args:
+            resource_specs: Specifications of the resources to generate
+            journey: Original patient journey
+            existing_resources: Already generated resources for reference
+            patient_context: Optional additional context
+            resource_id_map: Map of resourceType to assigned UUIDs
+            on_resource: Optional callback receiving (position, resource) for
+                each generated resource as soon as it is available
 
-{f"Additional Context: {patient_context}" if patient_context else ""}
+        Returns:
+            Generated resources (same order as specs), None where generation failed
+        """
+        resource_types = ", ".join(spec.get("resourceType")
+                                   for spec in resource_specs)
+        messages = self._build_group_generation_messages(
+            resource_specs, journey, existing_resources, patient_context, resource_id_map
+        )
+        results: List[Optional[Dict[str, Any]]] = [None] * len(resource_specs)
+        received = 0
+
+        def deliver(resources: List[Any]) -> None:
+            nonlocal received
+            for resource in resources:
+                idx = received
+                received += 1
+                if idx >= len(resource_specs) or not isinstance(resource, dict):
+                    continue
+                results[idx] = self._finalize_generated_resource(
+                    resource, resource_specs[idx])
+                if on_resource:
+                    on_resource(idx, results[idx])
 
-Resource to Generate: {resource_type}
-Description: {description}
-Key Data Points: {self._format_key_data(key_data)}
+        try:
+            if self.stream_responses:
+                array_stream = _ResourceArrayStream()
+                async for text in self._chat_completion_stream_async(messages):
+                    deliver(array_stream.feed(text))
+            else:
+                content = await self._chat_completion_async(messages)
+                deliver(json.loads(content).get("resources", []))
 
-Already Generated Resources:
-{existing_resources_summary}
+        except Exception as e:
+            print(f"  Error generating {resource_types}: {e}")
+            return results
 
-{id_map_text}
+        for resource_spec, resource in zip(resource_specs, results):
+            if resource is None:
+                print(
+                    f"  Error generating {resource_spec.get('resourceType')}: missing from response")
+        return results
 
-{schema_context}
+    def _build_group_generation_messages(
+        self,
+        resource_specs: List[Dict[str, Any]],
+        journey: PatientJourney,
+        existing_resources: List[Dict[str, Any]],
+        patient_context: Optional[str] = None,
+        resource_id_map: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages used to generate several FHIR resources at once.
 
-{resource_guidance}
+        Args:
+            resource_specs: Specifications of the resources to generate
+            journey: Original patient journey
+            existing_resources: Already generated resources for reference
+            patient_context: Optional additional context
+            resource_id_map: Map of resourceType to assigned UUIDs
 
-CRITICAL REQUIREMENTS:
-1. Generate a complete, valid FHIR {self.fhir_version} {resource_type} resource
-2. Include all required fields for {resource_type} (see schema and guidance above)
-3. Use proper FHIR data types and structures as defined in the schema
-4. Reference other resources appropriately using the Resource IDs provided above (e.g., Patient/{{patient_id}})
-5. ONLY use data that is EXPLICITLY mentioned in the journey stages, context, or key data points above
-6. DO NOT add clinical information that is not in the journey
-7. DO NOT make assumptions or add "typical" data for this resource type
-8. DO NOT infer information - if a data point isn't mentioned, omit it or use a minimal placeholder
-9. Use appropriate coding systems (LOINC, SNOMED CT, RxNorm, etc.) ONLY for items explicitly mentioned
-10. Follow the property descriptions from the schema
-11. IMPORTANT: Use the assigned ID "{assigned_id}" as the "id" field for this resource
-12. Return ONLY the JSON for the {resource_type} resource, no explanations
-13. Ensure ALL required fields have valid values according to FHIR spec
-14. For CodeableConcept fields, always include at least a 'text' field even if you don't have a specific code
-15. Use the minimal example from the guidance as a starting template
+        Returns:
+            List of chat messages (system and user)
+        """
+        journey_context = self._format_journey_context(
+            journey, patient_context, resource_id_map)
+        existing_resources_summary = self._format_existing_resources(
+            existing_resources)
 
-STAY FAITHFUL TO THE JOURNEY: If the journey doesn't mention specific details (like exact measurements, codes, dates), use minimal but valid FHIR structures. Don't invent clinical data.
+        # One reference block per distinct resource type, in plan order
+        resource_types = list(dict.fromkeys(
+            spec.get("resourceType") for spec in resource_specs))
+        resource_contexts = "\n\n".join(
+            self._get_resource_context(resource_type) for resource_type in resource_types)
 
-Return the resource as a valid JSON object."""
+        resource_lines = []
+        for idx, spec in enumerate(resource_specs, 1):
+            resource_lines.append(f"{idx}. {spec.get('resourceType')}")
+            resource_lines.append(
+                f"   Description: {spec.get('description', '')}")
+            resource_lines.append(
+                f"   Key Data Points: {self._format_key_data(spec.get('key_data', []))}")
+            resource_lines.append(
+                f"   Assigned ID: {spec.get('assigned_id')}")
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a FHIR expert who generates valid FHIR {self.fhir_version} resources. You always return valid JSON. You ONLY use data explicitly mentioned in the provided patient journey - you never add information not stated in the journey.",
-                    },
-                    {"role": "user", "content": generation_prompt},
-                ],
-
-                response_format={"type": "json_object"},
-            )
+        generation_prompt = f"""{journey_context}
 
-            resource_json = response.choices[0].message.content
-            resource = json.loads(resource_json)
+---
 
-            # Ensure resourceType is set
-            resource["resourceType"] = resource_type
+{resource_contexts}
 
-            # Ensure the assigned ID is used
-            if assigned_id:
-                resource["id"] = assigned_id
+---
 
-            # Clean forbidden fields before validation
-            resource = self._clean_forbidden_fields(resource)
+Resources to Generate ({len(resource_specs)}):
+{chr(10).join(resource_lines)}
 
-            return resource
+Already Generated Resources:
+{existing_resources_summary}
 
-        except Exception as e:
-            print(f"  Error generating {resource_type}: {e}")
-            return None
+CRITICAL REQUIREMENTS:
+1. Generate a complete, valid FHIR {self.fhir_version} resource for EACH item listed above
+2. Include all required fields for each resource type (see schema and guidance above)
+3. Use proper FHIR data types and structures as defined in the schema
+4. Reference other resources appropriately using the Resource IDs provided above (e.g., Patient/{{patient_id}})
+5. ONLY use data that is EXPLICITLY mentioned in the journey stages, context, or key data points above
+6. DO NOT add clinical information that is not in the journey
+7. DO NOT make assumptions or add "typical" data for these resource types
+8. Use appropriate coding systems (LOINC, SNOMED CT, RxNorm, etc.) ONLY for items explicitly mentioned
+9. IMPORTANT: Use each item's Assigned ID as the "id" field of that resource
+10. For CodeableConcept fields, always include at least a 'text' field even if you don't have a specific code
 
-    async def _generate_single_resource_async(
+STAY FAITHFUL TO THE JOURNEY: If the journey doesn't mention specific details (like exact measurements, codes, dates), use minimal but valid FHIR structures. Don't invent clinical data.
+
+Return a JSON object of the form {{"resources": [...]}} with exactly {len(resource_specs)} resources, in the same order as listed above."""
+
+        return [
+            self._system_messages["generation"],
+            {"role": "user", "content": generation_prompt},
+        ]
+
+    def _build_generation_messages(
         self,
         resource_spec: Dict[str, Any],
         journey: PatientJourney,
         existing_resources: List[Dict[str, Any]],
         patient_context: Optional[str] = None,
         resource_id_map: Optional[Dict[str, str]] = None,
-    ) -> Optional[Dict[str, Any]]:
+    ) -> List[Dict[str, str]]:
         """
-        Async version of _generate_single_resource for parallel execution.
+        Build the chat messages used to generate a single FHIR resource.
 
         Args:
             resource_spec: Specification for the resource to generate
@@ -760,37 +1596,29 @@ Return the resource as a valid JSON object."""
             resource_id_map: Map of resourceType to assigned UUIDs
 
         Returns:
-            Generated FHIR resource as dict, or None if generation failed
+            List of chat messages (system and user)
         """
         resource_type = resource_spec.get("resourceType")
         description = resource_spec.get("description", "")
         key_data = resource_spec.get("key_data", [])
         assigned_id = resource_spec.get("assigned_id")  # Get pre-assigned UUID
 
-        journey_description = self._format_journey_for_prompt(journey)
+        # The journey block is identical for every resource of a journey and
+        # leads the prompt, so the provider's prompt cache can reuse it for
+        # all requests after the first one.
+        journey_context = self._format_journey_context(
+            journey, patient_context, resource_id_map)
         existing_resources_summary = self._format_existing_resources(
             existing_resources)
+        resource_context = self._get_resource_context(resource_type)
 
-        # Format resource ID map for prompt
-        id_map_text = self._format_resource_id_map(resource_id_map or {})
+        generation_prompt = f"""{journey_context}
 
-        # Get FHIR context for this resource type - use enhanced if available
-        if self.use_enhanced_context and self.data_loader and self.data_loader.is_loaded():
-            schema_context = self.data_loader.format_enhanced_context_for_prompt(
-                resource_type)
-        else:
-            schema_context = self.schema_loader.format_schema_for_prompt(
-                resource_type)
-
-        # Get resource-specific guidance
-        resource_guidance = self._get_resource_specific_guidance(resource_type)
-
-        generation_prompt = f"""Generate a valid FHIR {self.fhir_version} {resource_type} resource.
+---
 
-Patient Journey:
-{journey_description}
+{resource_context}
 
-{f"Additional Context: {patient_context}" if patient_context else ""}
+---
 
 Resource to Generate: {resource_type}
 Description: {description}
@@ -799,12 +1627,6 @@ Key Data Points: {self._format_key_data(key_data)}
 Already Generated Resources:
 {existing_resources_summary}
 
-{id_map_text}
-
-{schema_context}
-
-{resource_guidance}
-
 CRITICAL REQUIREMENTS:
 1. Generate a complete, valid FHIR {self.fhir_version} {resource_type} resource
 2. Include all required fields for {resource_type} (see schema and guidance above)
@@ -826,49 +1648,257 @@ STAY FAITHFUL TO THE JOURNEY: If the journey doesn't mention specific details (l
 
 Return the resource as a valid JSON object."""
 
+        return [
+            self._system_messages["generation"],
+            {"role": "user", "content": generation_prompt},
+        ]
+
+    def _get_schema_context(self, resource_type: str) -> str:
+        """FHIR reference data for a resource type, enhanced context if available."""
+        if self.use_enhanced_context and self.data_loader and self.data_loader.is_loaded():
+            return self.data_loader.format_enhanced_context_for_prompt(resource_type)
+        return self.schema_loader.format_schema_for_prompt(resource_type)
+
+    def _get_resource_context(self, resource_type: str) -> str:
+        """
+        Build the journey-independent part of a generation prompt.
+
+        Holds the task line, the FHIR schema or enhanced context and the
+        resource-specific guidance. It is built once per resource type and
+        reused verbatim, so every prompt for that type carries the same bytes.
+
+        Args:
+            resource_type: The FHIR resource type
+
+        Returns:
+            Reference block for generating this resource type
+        """
+        cached = self._resource_contexts.get(resource_type)
+        if cached is not None:
+            return cached
+
+        schema_context = self._get_schema_context(resource_type)
+
+        # Get resource-specific guidance
+        resource_guidance = self._get_resource_specific_guidance(resource_type)
+
+        context = f"""Generate a valid FHIR {self.fhir_version} {resource_type} resource.
+
+{schema_context}
+
+{resource_guidance}"""
+        self._resource_contexts[resource_type] = context
+        return context
+
+    def _finalize_generated_resource(
+        self, resource: Dict[str, Any], resource_spec: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Apply the planned resourceType and ID to a generated resource and clean it.
+
+        Args:
+            resource: Resource JSON returned by the model
+            resource_spec: Specification the resource was generated from
+
+        Returns:
+            Resource ready for validation
+        """
+        # Ensure resourceType is set
+        resource["resourceType"] = resource_spec.get("resourceType")
+
+        # Ensure the assigned ID is used
+        assigned_id = resource_spec.get("assigned_id")
+        if assigned_id:
+            resource["id"] = assigned_id
+
+        # Clean forbidden fields before validation
+        return self._clean_forbidden_fields(resource)
+
+    def _build_batch_request(
+        self, custom_id: str, messages: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """
+        Build one line of a Batch API input file.
+
+        Args:
+            custom_id: Identifier used to map the output back to its request
+            messages: Chat messages for the request
+
+        Returns:
+            Batch request dict for the chat completions endpoint
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": messages,
+                "response_format": _JSON_RESPONSE_FORMAT,
+            },
+        }
+
+    def _run_batch_job(
+        self, requests: List[Dict[str, Any]], poll_interval: float = 30.0
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit requests as a single batch job and wait for it to finish.
+
+        Args:
+            requests: Batch request dicts (see _build_batch_request)
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            Dict mapping custom_id to the parsed JSON content of each successful response
+        """
+        fd, input_path = tempfile.mkstemp(suffix=".jsonl")
         try:
-            response = await self.async_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a FHIR expert who generates valid FHIR {self.fhir_version} resources. You always return valid JSON. You ONLY use data explicitly mentioned in the provided patient journey - you never add information not stated in the journey.",
-                    },
-                    {"role": "user", "content": generation_prompt},
-                ],
-
-                response_format={"type": "json_object"},
-            )
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(json.dumps(request)
+                        for request in requests) + "\n")
+
+            with open(input_path, "rb") as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.remove(input_path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"   📡 Submitted batch {batch.id} with {len(requests)} requests")
 
-            resource_json = response.choices[0].message.content
-            resource = json.loads(resource_json)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+            print(f"   ⏳ Batch {batch.id}: {batch.status}")
 
-            # Ensure resourceType is set
-            resource["resourceType"] = resource_type
+        outputs = {}
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"   ❌ Batch {batch.id} ended with status: {batch.status}")
+            return outputs
 
-            # Ensure the assigned ID is used
-            if assigned_id:
-                resource["id"] = assigned_id
+        content = self.client.files.content(batch.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                output = json.loads(line)
+                body = output["response"]["body"]
+                outputs[output["custom_id"]] = json.loads(
+                    body["choices"][0]["message"]["content"])
+            except Exception as e:
+                print(f"   Warning: Could not parse batch output line: {e}")
 
-            # Clean forbidden fields before validation
-            resource = self._clean_forbidden_fields(resource)
+        print(f"   ✓ Batch {batch.id} completed: {len(outputs)}/{len(requests)} responses")
+        return outputs
 
-            return resource
+    async def _validate_batch_resources_async(
+        self,
+        journey: PatientJourney,
+        patient_context: Optional[str],
+        plan: GenerationPlan,
+        batch_resources: List[Optional[Dict[str, Any]]],
+    ) -> GenerationResult:
+        """
+        Validate resources returned by a batch job and fix the invalid ones.
 
-        except Exception as e:
-            print(f"  Error generating {resource_type}: {e}")
-            return None
+        Args:
+            journey: PatientJourney the resources were generated for
+            patient_context: Optional additional context
+            plan: Generation plan the batch requests were built from
+            batch_resources: Generated resources (same order as the plan, None if missing)
+
+        Returns:
+            GenerationResult for the journey
+        """
+        generated_resources = []
+        validation_results = []
+        errors = []
+        validation_data = []
+
+        for idx, (resource_spec, resource) in enumerate(zip(plan.resources_to_generate, batch_resources)):
+            resource_type = resource_spec.get("resourceType")
+            if not resource:
+                errors.append(f"Failed to generate {resource_type}")
+                continue
+
+            validation = self.validator.validate(resource)
+            validation_results.append(validation)
+            if validation.is_valid:
+                generated_resources.append(resource)
+            else:
+                validation_data.append({
+                    'resource': resource,
+                    'validation': validation,
+                    'spec': resource_spec,
+                    'index': idx
+                })
+
+        if validation_data:
+            fix_results = await self._fix_resources_parallel(
+                validation_data, journey, generated_resources, patient_context, plan.resource_id_map
+            )
+            for val_data, fixed_resource in zip(validation_data, fix_results):
+                resource_type = val_data['spec'].get('resourceType')
+                if fixed_resource:
+                    fixed_validation = self.validator.validate(fixed_resource)
+                    validation_results.append(fixed_validation)
+                    if fixed_validation.is_valid:
+                        generated_resources.append(fixed_resource)
+                        continue
+                errors.append(
+                    f"Validation failed for {resource_type}: {val_data['validation'].errors}"
+                )
+
+        success = bool(generated_resources) and not errors
+        self._print_generation_summary(
+            plan,
+            generated_resources,
+            validation_results,
+            success=success,
+            iterations=1,
+        )
+
+        return GenerationResult(
+            success=success,
+            fhir_data=self._create_bundle(
+                generated_resources) if generated_resources else None,
+            generated_resources=generated_resources,
+            validation_results=validation_results,
+            iterations=1,
+            errors=errors,
+            planning_details=plan,
+        )
 
-    async def _generate_resources_parallel(
+    async def _generate_resources_pipelined(
         self,
         resource_specs: List[Dict[str, Any]],
         journey: PatientJourney,
         existing_resources: List[Dict[str, Any]],
         patient_context: Optional[str] = None,
         resource_id_map: Optional[Dict[str, str]] = None,
-    ) -> List[Optional[Dict[str, Any]]]:
+    ) -> List[Any]:
         """
-        Generate multiple FHIR resources in parallel using async API calls.
+        Generate, validate and fix multiple FHIR resources concurrently.
+
+        Every resource gets its own generate -> validate -> fix pipeline and
+        all pipelines are awaited together. IDs are assigned up front in the
+        plan, so cross-resource references do not need to wait on each other.
+
+        When resources_per_request is greater than 1, up to that many specs
+        share one generation request; validation and fixes stay per resource
+        and start as soon as a resource has been generated (with
+        stream_responses, while the rest of the response is still streaming).
+        Specs missing from a grouped response are retried with a request of
+        their own.
+
+        A spec may list resourceTypes in "depends_on" when it should be built
+        after another resource in the same batch has been generated. Such a
+        pipeline waits for the specs of those types that appear earlier in
+        the list and sees their results as existing resources; every other
+        pipeline runs immediately.
 
         Args:
             resource_specs: List of resource specifications to generate
@@ -878,16 +1908,156 @@ Return the resource as a valid JSON object."""
             resource_id_map: Map of resourceType to assigned UUIDs
 
         Returns:
-            List of generated resources (same order as input specs)
+            List of pipeline outcome dicts (same order as input specs), or the
+            exception raised by a pipeline that failed
         """
-        tasks = [
-            self._generate_single_resource_async(
-                resource_spec, journey, existing_resources, patient_context, resource_id_map
-            )
-            for resource_spec in resource_specs
-        ]
+        # Group spec indices into requests. Specs with dependencies are
+        # generated on their own, after the specs before them were scheduled.
+        group_size = max(1, self.resources_per_request)
+        groups: List[List[int]] = []
+        open_group: List[int] = []
+        for idx, resource_spec in enumerate(resource_specs):
+            if resource_spec.get("depends_on"):
+                if open_group:
+                    groups.append(open_group)
+                    open_group = []
+                groups.append([idx])
+                continue
 
-        return await asyncio.gather(*tasks)
+            open_group.append(idx)
+            if len(open_group) == group_size:
+                groups.append(open_group)
+                open_group = []
+        if open_group:
+            groups.append(open_group)
+
+        tasks: List[asyncio.Task] = []
+        spec_tasks: Dict[int, Tuple[asyncio.Task, int]] = {}
+
+        async def run_pipeline(indices, dependencies):
+            context_resources = existing_resources
+            if dependencies:
+                # Only earlier tasks are awaited, so dependencies cannot cycle
+                await asyncio.gather(*{task for task, _ in dependencies}, return_exceptions=True)
+                context_resources = existing_resources + [
+                    outcome["fixed_resource"] or outcome["resource"]
+                    for outcome in (
+                        task.result()[pos]
+                        for task, pos in dependencies
+                        if not task.exception()
+                    )
+                    if outcome["fixed_resource"] or outcome["resource"]
+                ]
+
+            specs = [resource_specs[idx] for idx in indices]
+            checks: Dict[int, asyncio.Future] = {}
+
+            def start_check(pos, resource):
+                # Validation (and fixing) starts as soon as a resource exists
+                checks[pos] = asyncio.ensure_future(self._validate_and_fix_async(
+                    resource, specs[pos], journey, context_resources, patient_context, resource_id_map
+                ))
+
+            if len(specs) == 1:
+                start_check(0, await self._generate_single_resource_async(
+                    specs[0], journey, context_resources, patient_context, resource_id_map
+                ))
+            else:
+                await self._generate_resource_group_async(
+                    specs, journey, context_resources, patient_context, resource_id_map,
+                    on_resource=start_check,
+                )
+                # Specs the grouped response did not cover get a request of their own
+                missing = [pos for pos in range(len(specs)) if pos not in checks]
+                if missing:
+                    retried = await asyncio.gather(*[
+                        self._generate_single_resource_async(
+                            specs[pos], journey, context_resources, patient_context, resource_id_map
+                        )
+                        for pos in missing
+                    ])
+                    for pos, resource in zip(missing, retried):
+                        start_check(pos, resource)
+
+            return await asyncio.gather(*[checks[pos] for pos in range(len(specs))])
+
+        for indices in groups:
+            depends_on = set()
+            for idx in indices:
+                depends_on.update(resource_specs[idx].get("depends_on") or [])
+            dependencies = [
+                spec_tasks[dep_idx]
+                for dep_idx in range(indices[0])
+                if resource_specs[dep_idx].get("resourceType") in depends_on
+            ]
+
+            task = asyncio.ensure_future(run_pipeline(indices, dependencies))
+            tasks.append(task)
+            for pos, idx in enumerate(indices):
+                spec_tasks[idx] = (task, pos)
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for idx in range(len(resource_specs)):
+            task, pos = spec_tasks[idx]
+            error = task.exception()
+            results.append(error if error else task.result()[pos])
+        return results
+
+    async def _validate_and_fix_async(
+        self,
+        generated_resource: Optional[Dict[str, Any]],
+        resource_spec: Dict[str, Any],
+        journey: PatientJourney,
+        existing_resources: List[Dict[str, Any]],
+        patient_context: Optional[str] = None,
+        resource_id_map: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Validate a generated FHIR resource and fix it if needed.
+
+        Args:
+            generated_resource: Generated resource, or None if generation failed
+            resource_spec: Specification the resource was generated from
+            journey: Original patient journey
+            existing_resources: Already generated resources for reference
+            patient_context: Optional additional context
+            resource_id_map: Map of resourceType to assigned UUIDs
+
+        Returns:
+            Dict with 'resource', 'validation', 'fixed_resource' and
+            'fixed_validation' keys (None where a step did not run)
+        """
+        outcome = {
+            "resource": None,
+            "validation": None,
+            "fixed_resource": None,
+            "fixed_validation": None,
+        }
+        if not generated_resource:
+            return outcome
+
+        outcome["resource"] = generated_resource
+        outcome["validation"] = self.validator.validate(generated_resource)
+        if outcome["validation"].is_valid:
+            return outcome
+
+        fixed_resource = await self._fix_invalid_resource_async(
+            generated_resource,
+            outcome["validation"],
+            resource_spec,
+            journey,
+            existing_resources,
+            patient_context,
+            resource_id_map,
+        )
+        if fixed_resource:
+            outcome["fixed_resource"] = fixed_resource
+            outcome["fixed_validation"] = self.validator.validate(
+                fixed_resource)
+
+        return outcome
 
     async def _fix_resources_parallel(
         self,
@@ -925,7 +2095,32 @@ Return the resource as a valid JSON object."""
 
         return await asyncio.gather(*tasks)
 
-    async def _fix_invalid_resource_async(
+    @staticmethod
+    def _resource_digest(resource: Dict[str, Any]) -> bytes:
+        """Hash a resource's canonical JSON, to spot repeated fix attempts."""
+        canonical = json.dumps(resource, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(canonical, digest_size=16).digest()
+
+    def _repair_locally(
+        self, invalid_resource: Dict[str, Any], validation_result: ValidationResult
+    ) -> Tuple[Dict[str, Any], ValidationResult]:
+        """
+        Apply the validator's deterministic repairs to an invalid resource.
+
+        Args:
+            invalid_resource: The resource that failed validation
+            validation_result: ValidationResult with error details
+
+        Returns:
+            Repaired resource and its validation result, or the inputs
+            unchanged if nothing could be repaired
+        """
+        repaired = self.validator.repair(invalid_resource)
+        if repaired is None:
+            return invalid_resource, validation_result
+        return repaired, self.validator.validate(repaired)
+
+    def _build_fix_prompt(
         self,
         invalid_resource: Dict[str, Any],
         validation_result: ValidationResult,
@@ -934,9 +2129,9 @@ Return the resource as a valid JSON object."""
         existing_resources: List[Dict[str, Any]],
         patient_context: Optional[str] = None,
         resource_id_map: Optional[Dict[str, str]] = None,
-    ) -> Optional[Dict[str, Any]]:
+    ) -> str:
         """
-        Async version of _fix_invalid_resource for parallel execution.
+        Build the prompt for the first attempt at fixing an invalid resource.
 
         Args:
             invalid_resource: The resource that failed validation
@@ -948,7 +2143,7 @@ Return the resource as a valid JSON object."""
             resource_id_map: Map of resourceType to assigned UUIDs
 
         Returns:
-            Fixed FHIR resource as dict, or None if fixing failed
+            Fix prompt for the user message
         """
         resource_type = invalid_resource.get("resourceType", "Unknown")
         assigned_id = resource_spec.get("assigned_id")
@@ -957,42 +2152,36 @@ Return the resource as a valid JSON object."""
         errors_text = "\n".join(
             f"- {error}" for error in validation_result.errors)
 
-        journey_description = self._format_journey_for_prompt(journey)
+        # Like the generation prompts, lead with the journey block and then
+        # the per-type schema, so fixes of one journey (and of one type)
+        # share a prefix the provider's prompt cache can reuse; the resource
+        # and its errors come last.
+        journey_context = self._format_journey_context(
+            journey, patient_context, resource_id_map)
         existing_resources_summary = self._format_existing_resources(
             existing_resources)
+        schema_context = self._get_schema_context(resource_type)
 
-        # Format resource ID map for prompt
-        id_map_text = self._format_resource_id_map(resource_id_map or {})
+        return f"""{journey_context}
 
-        # Get FHIR context for this resource type - use enhanced if available
-        if self.use_enhanced_context and self.data_loader and self.data_loader.is_loaded():
-            schema_context = self.data_loader.format_enhanced_context_for_prompt(
-                resource_type)
-        else:
-            schema_context = self.schema_loader.format_schema_for_prompt(
-                resource_type)
-
-        fix_prompt = f"""You are a FHIR expert. A {resource_type} resource was generated but failed validation.
+---
 
-Your task: Fix the validation errors while preserving the clinical meaning.
-
-ORIGINAL RESOURCE (with errors):
-{json.dumps(invalid_resource, indent=2)}
+{schema_context}
 
-VALIDATION ERRORS:
-{errors_text}
+---
 
-Patient Journey (for context):
-{journey_description}
+A {resource_type} resource was generated but failed validation.
 
-{f"Additional Context: {patient_context}" if patient_context else ""}
+Your task: Fix the validation errors while preserving the clinical meaning.
 
 Already Generated Resources (for reference):
 {existing_resources_summary}
 
-{id_map_text}
+ORIGINAL RESOURCE (with errors):
+{json.dumps(invalid_resource, separators=(',', ':'), ensure_ascii=False)}
 
-{schema_context}
+VALIDATION ERRORS:
+{errors_text}
 
 Requirements:
 1. Fix ALL validation errors listed above
@@ -1007,163 +2196,76 @@ Requirements:
 
 Return the fixed resource as a valid JSON object."""
 
-        for attempt in range(1, self.max_fix_retries + 1):
-            try:
-                response = await self.async_client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"You are a FHIR expert who fixes validation errors in FHIR {self.fhir_version} resources. You always return valid, corrected JSON.",
-                        },
-                        {"role": "user", "content": fix_prompt},
-                    ],
-                    response_format={"type": "json_object"},
-                )
-
-                fixed_resource = json.loads(
-                    response.choices[0].message.content)
-
-                # Ensure resourceType is preserved
-                fixed_resource["resourceType"] = resource_type
-
-                # Ensure the assigned ID is preserved
-                if assigned_id:
-                    fixed_resource["id"] = assigned_id
-
-                # Clean forbidden fields before validation
-                fixed_resource = self._clean_forbidden_fields(fixed_resource)
-
-                # Validate the fixed resource
-                fixed_validation = self.validator.validate(fixed_resource)
-
-                if fixed_validation.is_valid:
-                    return fixed_resource
-                else:
-                    # Update errors for next attempt
-                    errors_text = "\n".join(
-                        f"- {error}" for error in fixed_validation.errors)
-
-                    # Update the prompt for the next iteration
-                    fix_prompt = f"""The previous fix attempt still has validation errors. Try again.
+    @staticmethod
+    def _build_retry_fix_prompt(
+        fixed_resource: Dict[str, Any], fixed_validation: ValidationResult
+    ) -> str:
+        """Build the prompt for another attempt after a fix still failed validation."""
+        errors_text = "\n".join(
+            f"- {error}" for error in fixed_validation.errors)
+        return f"""The previous fix attempt still has validation errors. Try again.
 
 RESOURCE (with remaining errors):
-{json.dumps(fixed_resource, indent=2)}
+{json.dumps(fixed_resource, separators=(',', ':'), ensure_ascii=False)}
 
 REMAINING VALIDATION ERRORS:
 {errors_text}
 
 Fix these errors while maintaining the clinical meaning."""
 
-            except Exception as e:
-                if attempt == self.max_fix_retries:
-                    return None
-                continue
-
-        return None
-
-    def _fix_invalid_resource(
+    async def _fix_invalid_resource_async(
         self,
         invalid_resource: Dict[str, Any],
         validation_result: ValidationResult,
         resource_spec: Dict[str, Any],
         journey: PatientJourney,
-        existing_resources: List[Dict[str, Any]],
-        patient_context: Optional[str] = None,
-        resource_id_map: Optional[Dict[str, str]] = None,
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Attempt to fix an invalid FHIR resource using AI based on validation errors.
-
-        Args:
-            invalid_resource: The resource that failed validation
-            validation_result: ValidationResult with error details
-            resource_spec: Original specification for the resource
-            journey: Original patient journey
-            existing_resources: Already generated resources for reference
-            patient_context: Optional additional context
-            resource_id_map: Map of resourceType to assigned UUIDs
-
-        Returns:
-            Fixed FHIR resource as dict, or None if fixing failed
-        """
-        resource_type = invalid_resource.get("resourceType", "Unknown")
-        assigned_id = resource_spec.get("assigned_id")  # Get pre-assigned UUID
-
-        # Format the errors for the AI
-        errors_text = "\n".join(
-            f"- {error}" for error in validation_result.errors)
-
-        journey_description = self._format_journey_for_prompt(journey)
-        existing_resources_summary = self._format_existing_resources(
-            existing_resources)
-
-        # Format resource ID map for prompt
-        id_map_text = self._format_resource_id_map(resource_id_map or {})
-
-        # Get FHIR context for this resource type - use enhanced if available
-        if self.use_enhanced_context and self.data_loader and self.data_loader.is_loaded():
-            schema_context = self.data_loader.format_enhanced_context_for_prompt(
-                resource_type)
-        else:
-            schema_context = self.schema_loader.format_schema_for_prompt(
-                resource_type)
-
-        fix_prompt = f"""You are a FHIR expert. A {resource_type} resource was generated but failed validation.
-
-Your task: Fix the validation errors while preserving the clinical meaning.
-
-ORIGINAL RESOURCE (with errors):
-{json.dumps(invalid_resource, indent=2)}
-
-VALIDATION ERRORS:
-{errors_text}
-
-Patient Journey (for context):
-{journey_description}
-
-{f"Additional Context: {patient_context}" if patient_context else ""}
+        existing_resources: List[Dict[str, Any]],
+        patient_context: Optional[str] = None,
+        resource_id_map: Optional[Dict[str, str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Attempt to fix an invalid FHIR resource using AI based on validation errors.
 
-Already Generated Resources (for reference):
-{existing_resources_summary}
+        Args:
+            invalid_resource: The resource that failed validation
+            validation_result: ValidationResult with error details
+            resource_spec: Original specification for the resource
+            journey: Original patient journey
+            existing_resources: Already generated resources for reference
+            patient_context: Optional additional context
+            resource_id_map: Map of resourceType to assigned UUIDs
 
-{id_map_text}
+        Returns:
+            Fixed FHIR resource as dict, or None if fixing failed
+        """
+        resource_type = invalid_resource.get("resourceType", "Unknown")
+        assigned_id = resource_spec.get("assigned_id")
 
-{schema_context}
+        # Structural slips are repaired locally; the LLM only gets what is left
+        invalid_resource, validation_result = self._repair_locally(
+            invalid_resource, validation_result)
+        if validation_result.is_valid:
+            print(f"        🔧 {resource_type} repaired locally, no LLM call needed")
+            return invalid_resource
 
-Requirements:
-1. Fix ALL validation errors listed above
-2. Maintain the clinical meaning and data from the original resource
-3. Ensure all required fields for {resource_type} are present and correct (see schema above)
-4. Use proper FHIR {self.fhir_version} data types and structures as defined in the schema
-5. Reference other resources appropriately using the Resource IDs provided above (e.g., Patient/{assigned_id})
-6. Use appropriate coding systems (LOINC, SNOMED CT, RxNorm, etc.)
-7. Follow the property descriptions from the schema
-8. IMPORTANT: Ensure the ID field is "{assigned_id}"
-9. Return ONLY the corrected JSON for the {resource_type} resource
+        fix_prompt = self._build_fix_prompt(
+            invalid_resource, validation_result, resource_spec, journey,
+            existing_resources, patient_context, resource_id_map)
 
-Return the fixed resource as a valid JSON object."""
+        # Resources already known to fail validation; getting one of them back
+        # means the next attempt would repeat an identical request
+        seen_digests = {self._resource_digest(invalid_resource)}
 
         for attempt in range(1, self.max_fix_retries + 1):
             try:
-                print(
-                    f"        🔄 Fix attempt {attempt}/{self.max_fix_retries}...")
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"You are a FHIR expert who fixes validation errors in FHIR {self.fhir_version} resources. You always return valid, corrected JSON.",
-                        },
+                content = await self._chat_completion_async(
+                    [
+                        self._system_messages["fix"],
                         {"role": "user", "content": fix_prompt},
-                    ],
-
-                    response_format={"type": "json_object"},
+                    ]
                 )
 
-                fixed_resource = json.loads(
-                    response.choices[0].message.content)
+                fixed_resource = json.loads(content)
 
                 # Ensure resourceType is preserved
                 fixed_resource["resourceType"] = resource_type
@@ -1175,40 +2277,38 @@ Return the fixed resource as a valid JSON object."""
                 # Clean forbidden fields before validation
                 fixed_resource = self._clean_forbidden_fields(fixed_resource)
 
+                digest = self._resource_digest(fixed_resource)
+                if digest in seen_digests:
+                    print(
+                        f"        ✗ {resource_type} fix attempt {attempt} returned an unchanged resource, giving up")
+                    return None
+                seen_digests.add(digest)
+
                 # Validate the fixed resource
                 fixed_validation = self.validator.validate(fixed_resource)
 
                 if fixed_validation.is_valid:
-                    print(f"        ✓ Fix successful on attempt {attempt}!")
                     return fixed_resource
                 else:
-                    # Update errors for next attempt
-                    errors_text = "\n".join(
-                        f"- {error}" for error in fixed_validation.errors)
-                    print(
-                        f"        ⚠️  Still has {len(fixed_validation.errors)} error(s), retrying...")
-
-                    # Update the prompt for the next iteration
-                    fix_prompt = f"""The previous fix attempt still has validation errors. Try again.
-
-RESOURCE (with remaining errors):
-{json.dumps(fixed_resource, indent=2)}
-
-REMAINING VALIDATION ERRORS:
-{errors_text}
-
-Fix these errors while maintaining the clinical meaning."""
+                    # Ask again with the remaining errors
+                    fix_prompt = self._build_retry_fix_prompt(
+                        fixed_resource, fixed_validation)
 
             except Exception as e:
-                print(f"        ❌ Error during fix attempt {attempt}: {e}")
+                # Fixes run concurrently, so name the resource in the line
+                print(
+                    f"        ❌ Error during {resource_type} fix attempt {attempt}: {e}")
                 if attempt == self.max_fix_retries:
+                    print(
+                        f"        ✗ Could not fix {resource_type} after {self.max_fix_retries} attempts")
                     return None
                 continue
 
-        print(f"        ✗ Could not fix after {self.max_fix_retries} attempts")
+        print(
+            f"        ✗ Could not fix {resource_type} after {self.max_fix_retries} attempts")
         return None
 
-    def _check_completeness(
+    async def _check_completeness_async(
         self,
         journey: PatientJourney,
         generated_resources: List[Dict[str, Any]],
@@ -1227,9 +2327,45 @@ Fix these errors while maintaining the clinical meaning."""
         Returns:
             Dict with is_complete flag and any additional_resources needed
         """
+        try:
+            content = await self._chat_completion_async(
+                self._build_completeness_messages(
+                    generated_resources, journey_description, patient_context
+                )
+            )
+
+            result = json.loads(content)
+            print(f"\nCompleteness Check: {result.get('reasoning', '')}")
+
+            return result
+
+        except Exception as e:
+            print(f"Error checking completeness: {e}")
+            # Default to incomplete with no additional resources
+            return {"is_complete": False, "additional_resources": []}
+
+    def _build_completeness_messages(
+        self,
+        generated_resources: List[Dict[str, Any]],
+        journey_description: str,
+        patient_context: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages used to check journey completeness.
+
+        Args:
+            generated_resources: Resources generated so far
+            journey_description: Formatted journey description
+            patient_context: Optional additional context
+
+        Returns:
+            List of chat messages (system and user)
+        """
         resources_summary = self._format_existing_resources(
             generated_resources)
 
+        # Everything but the resource summary is fixed for the journey, so it
+        # leads the prompt and later checks can reuse the cached prefix
         completeness_prompt = f"""You are a FHIR expert reviewing if generated resources completely represent a patient journey.
 
 Patient Journey:
@@ -1237,9 +2373,6 @@ Patient Journey:
 
 {f"Additional Context: {patient_context}" if patient_context else ""}
 
-Generated FHIR Resources:
-{resources_summary}
-
 Your task:
 1. Review if the generated resources completely capture ALL events explicitly mentioned in the patient journey
 2. Check if any explicitly mentioned clinical events, conditions, observations, procedures, or medications are missing
@@ -1266,31 +2399,15 @@ Return a JSON object with this structure:
     ]
 }}
 
-Remember: Only flag as incomplete if something explicitly mentioned in the journey is missing from resources."""
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a FHIR expert who assesses completeness of FHIR resource sets.",
-                    },
-                    {"role": "user", "content": completeness_prompt},
-                ],
-
-                response_format={"type": "json_object"},
-            )
-
-            result = json.loads(response.choices[0].message.content)
-            print(f"\nCompleteness Check: {result.get('reasoning', '')}")
+Remember: Only flag as incomplete if something explicitly mentioned in the journey is missing from resources.
 
-            return result
+Generated FHIR Resources:
+{resources_summary}"""
 
-        except Exception as e:
-            print(f"Error checking completeness: {e}")
-            # Default to incomplete with no additional resources
-            return {"is_complete": False, "additional_resources": []}
+        return [
+            self._system_messages["completeness"],
+            {"role": "user", "content": completeness_prompt},
+        ]
 
     def _print_generation_summary(
         self,
@@ -1330,6 +2447,12 @@ Remember: Only flag as incomplete if something explicitly mentioned in the journ
             success_rate = (built_count / planned_count) * 100
             print(f"Build Success Rate: {success_rate:.1f}%")
 
+        usage = _journey_usage.get()
+        if usage is not None and usage.prompt_tokens:
+            print(f"\nTokens: {usage.prompt_tokens} prompt, {usage.completion_tokens} completion")
+            print(f"Prompt Cache Hit Rate: {usage.cache_hit_rate * 100:.1f}% "
+                  f"({usage.cached_tokens} cached)")
+
         # Show what was planned
         print(f"\nPlanned Resources:")
         for i, resource_spec in enumerate(initial_plan.resources_to_generate, 1):
@@ -1370,8 +2493,42 @@ Remember: Only flag as incomplete if something explicitly mentioned in the journ
 
         print("\n" + "=" * 70)
 
+    def _format_journey_context(
+        self,
+        journey: PatientJourney,
+        patient_context: Optional[str] = None,
+        resource_id_map: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Format the journey-wide block shared by all generation prompts.
+
+        Holds only what is fixed for the whole journey (journey, context and
+        the planned resource IDs), so it is byte-identical across requests.
+
+        Args:
+            journey: Original patient journey
+            patient_context: Optional additional context
+            resource_id_map: Map of resourceType to assigned UUIDs
+
+        Returns:
+            Formatted journey block
+        """
+        parts = [
+            f"Patient Journey:\n{self._format_journey_for_prompt(journey)}"]
+        if patient_context:
+            parts.append(f"Additional Context: {patient_context}")
+        id_map_text = self._format_resource_id_map(resource_id_map or {})
+        if id_map_text:
+            parts.append(id_map_text)
+        return "\n\n".join(parts)
+
     def _format_journey_for_prompt(self, journey: PatientJourney) -> str:
         """Format a PatientJourney for inclusion in prompts."""
+        # While a journey is being generated its text is formatted only once
+        cached = self._journey_descriptions.get(id(journey))
+        if cached is not None and cached[0] is journey:
+            return cached[1]
+
         lines = []
         if journey.patient_id:
             lines.append(f"Patient ID: {journey.patient_id}")
@@ -1385,10 +2542,22 @@ Remember: Only flag as incomplete if something explicitly mentioned in the journ
                 lines.append(f"   Description: {stage.description}")
             if stage.metadata:
                 lines.append(
-                    f"   Metadata: {json.dumps(stage.metadata, indent=6)}")
+                    f"   Metadata: {json.dumps(stage.metadata, separators=(',', ':'), sort_keys=True, ensure_ascii=False)}")
 
         return "\n".join(lines)
 
+    @staticmethod
+    def _compact_context(text: Optional[str]) -> Optional[str]:
+        """
+        Collapse whitespace in free-text context to a single line.
+
+        Patient context is often written as an indented multi-line string,
+        and the indentation is sent (and billed) with every prompt.
+        """
+        if not text:
+            return text
+        return re.sub(r"\s+", " ", text).strip()
+
     def _format_existing_resources(self, resources: List[Dict[str, Any]]) -> str:
         """Format existing resources for inclusion in prompts."""
         if not resources:
@@ -1716,15 +2885,277 @@ Example minimal Immunization:
 
     def _create_bundle(self, resources: List[Dict[str, Any]]) -> FHIRPatientData:
         """Create a FHIR Bundle from generated resources."""
-        entries = []
-        for resource in resources:
-            entries.append({"resource": resource})
-
         return FHIRPatientData(
             resourceType="Bundle",
-            entries=entries,
+            entries=[{"resource": resource} for resource in resources],
         )
 
+    def _get_patient_name(self, fhir_data: FHIRPatientData) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the first given name and family name of the Patient in a bundle.
+
+        Args:
+            fhir_data: Bundle to search for a Patient resource
+
+        Returns:
+            Tuple of (given name, family name), either of which may be None
+        """
+        for entry in fhir_data.entries:
+            resource = entry.get("resource", {})
+            if resource.get("resourceType") != "Patient":
+                continue
+
+            names = resource.get("name") or [{}]
+            name = names[0] if isinstance(names[0], dict) else {}
+            given = name.get("given") or [None]
+            return given[0], name.get("family")
+
+        return None, None
+
+    def _extract_patient_name(self, fhir_data: FHIRPatientData) -> Tuple[str, str]:
+        """
+        Extract a filesystem-safe (first, last) patient name from a bundle.
+
+        Names are lowercased and any non-alphanumeric character is replaced
+        with an underscore. Falls back to ("unknown", "patient").
+
+        Args:
+            fhir_data: Bundle containing the Patient resource
+
+        Returns:
+            Tuple of sanitized (first name, last name)
+        """
+        def sanitize(value: Optional[str]) -> Optional[str]:
+            if not value:
+                return None
+            cleaned = "".join(c if c.isalnum() else "_" for c in value.lower())
+            return cleaned.strip("_") or None
+
+        given, family = self._get_patient_name(fhir_data)
+        first_name, last_name = sanitize(given), sanitize(family)
+        if not first_name and not last_name:
+            return "unknown", "patient"
+
+        return first_name or "unknown", last_name or "patient"
+
+    @staticmethod
+    def _replace_file(path: Path, write: Callable[[Any], None], buffering: int) -> None:
+        """
+        Write a file through a temporary sibling that is then renamed over it.
+
+        Readers (and a crashed run) never see a half-written file: the path
+        either holds its previous contents or the complete new ones. The data
+        is not fsynced; the rename only orders the update, durability is left
+        to the OS flushing its page cache.
+
+        Args:
+            path: File to write
+            write: Called with the open binary file to write the contents
+            buffering: Buffer size for the temporary file
+        """
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb", buffering=buffering) as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def _write_file(cls, path: Path, data: bytes) -> None:
+        """
+        Write pre-serialized bytes to a file with a single buffered write.
+
+        The buffer is sized to hold the whole payload (at least 1 MiB), so
+        the data reaches the OS in one write instead of many 8 KB chunks.
+        The file is replaced atomically (see _replace_file).
+
+        Args:
+            path: File to write
+            data: Serialized file contents
+        """
+        cls._replace_file(path, lambda f: f.write(data), max(len(data), 1 << 20))
+
+    @classmethod
+    def _write_jsonl(cls, path: Path, resources: Iterable[Dict[str, Any]]) -> None:
+        """
+        Stream resources to a JSONL file, one resource per line.
+
+        Each resource is serialized and written as it is consumed, so no
+        intermediate list of lines is built; the 1 MiB buffer batches the
+        per-line writes into one syscall per MiB of output. The file is
+        replaced atomically (see _replace_file).
+
+        Args:
+            path: File to write
+            resources: Resources to write, consumed lazily
+        """
+        def write(f):
+            for resource in resources:
+                f.write((json.dumps(resource, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        cls._replace_file(path, write, 1 << 20)
+
+    @classmethod
+    def _write_bundle(cls, path: Path, header: Dict[str, Any], entries: List[Dict[str, Any]],
+                      indent: Optional[int]) -> None:
+        """
+        Write a FHIR Bundle, serializing its entries one at a time.
+
+        The output is the same as json.dumps(dict(header, entry=entries)),
+        but the whole Bundle is never held as one serialized string; only the
+        current entry is, and the 1 MiB buffer batches the writes. The file
+        is replaced atomically (see _replace_file).
+
+        Args:
+            path: File to write
+            header: Bundle fields to write before "entry"
+            entries: Bundle entries
+            indent: Indentation as for json.dumps; None writes compact JSON
+        """
+        separators = None if indent is not None else (",", ":")
+        newline = "\n" if indent is not None else ""
+        entry_newline = newline + " " * (2 * (indent or 0))
+
+        def dumps(obj):
+            return json.dumps(obj, indent=indent, separators=separators, ensure_ascii=False)
+
+        def write(f):
+            # The header's closing brace is reopened to append "entry"
+            opening = dumps(header)[:-1].rstrip("\n")
+            f.write(f"{opening}{',' if header else ''}{newline}{' ' * (indent or 0)}"
+                    f"\"entry\"{':' if indent is None else ': '}[".encode("utf-8"))
+            for i, entry in enumerate(entries):
+                # Strings never contain raw newlines, so this only re-indents
+                item = dumps(entry).replace("\n", entry_newline)
+                f.write(f"{',' if i else ''}{entry_newline}{item}".encode("utf-8"))
+            closing = f"{newline}{' ' * (indent or 0)}]" if entries else "]"
+            f.write(f"{closing}{newline}}}".encode("utf-8"))
+
+        cls._replace_file(path, write, 1 << 20)
+
+    def _save_bundle(self, fhir_data: FHIRPatientData, journey: PatientJourney) -> Optional[str]:
+        """
+        Save a generated bundle to save_directory/firstname_lastname/.
+
+        Writes patient_bundle.json (FHIR Bundle), bulk_fhir.jsonl (one resource
+        per line) and README.txt (summary). The Bundle and JSONL files are
+        streamed one entry at a time; the README is written in one go. All
+        files are UTF-8, with non-ASCII text written as-is rather than
+        \\u-escaped.
+
+        Args:
+            fhir_data: Bundle to save
+            journey: Journey the bundle was generated from
+
+        Returns:
+            Path of the directory the files were written to, or None on failure
+        """
+        try:
+            first_name, last_name = self._extract_patient_name(fhir_data)
+            output_dir = Path(self.save_directory) / \
+                f"{first_name}_{last_name}"
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            bundle = {
+                "resourceType": "Bundle",
+                "type": "collection",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+
+            given, family = self._get_patient_name(fhir_data)
+            display_name = " ".join(
+                part for part in (given, family) if part) or "Unknown Patient"
+            resource_counts: Dict[str, int] = {}
+            for entry in fhir_data.entries:
+                resource_type = entry.get("resource", {}).get(
+                    "resourceType", "Unknown")
+                resource_counts[resource_type] = resource_counts.get(
+                    resource_type, 0) + 1
+
+            readme_lines = [
+                "FHIR Patient Bundle",
+                "=" * 40,
+                f"Patient: {display_name}",
+                f"Patient ID: {getattr(journey, 'patient_id', None) or 'N/A'}",
+                f"Generated: {bundle['timestamp']}",
+                f"FHIR Version: {self.fhir_version}",
+                f"Total Resources: {len(fhir_data.entries)}",
+                "",
+                "Resources:",
+            ]
+            readme_lines.extend(
+                f"  {resource_type}: {count}"
+                for resource_type, count in sorted(resource_counts.items())
+            )
+            readme_lines.extend([
+                "",
+                "Files:",
+                "  patient_bundle.json - Complete FHIR Bundle",
+                "  bulk_fhir.jsonl - Bulk FHIR format (one resource per line)",
+            ])
+            readme_bytes = ("\n".join(readme_lines) + "\n").encode("utf-8")
+
+            # indent forces json's pure-Python encoder; compact output
+            # goes through the C encoder
+            self._write_bundle(
+                output_dir / "patient_bundle.json", bundle, fhir_data.entries,
+                indent=2 if self.pretty_json else None,
+            )
+            self._write_jsonl(
+                output_dir / "bulk_fhir.jsonl",
+                (entry.get("resource", {}) for entry in fhir_data.entries),
+            )
+            self._write_file(output_dir / "README.txt", readme_bytes)
+
+            print(f"\n💾 Saved FHIR bundle to: {output_dir}")
+            return str(output_dir)
+
+        except Exception as e:
+            print(f"Error saving FHIR bundle: {e}")
+            return None
+
+    def save_combined_jsonl(self, results: List[GenerationResult]) -> Optional[str]:
+        """
+        Save the resources of several journeys to one JSONL file.
+
+        Streams every bundle's resources into save_directory/all_patients.jsonl
+        (one resource per line), without creating per-patient folders. One
+        directory check and one buffered file serve the whole set of
+        results, so this is the cheaper way to save many journeys; run them
+        with auto_save=False and save the results once at the end.
+
+        Args:
+            results: Generation results to save; saved_path is set on each
+                result that has a bundle
+
+        Returns:
+            Path of the written file, or None on failure
+        """
+        try:
+            output_dir = Path(self.save_directory)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            output_file = output_dir / "all_patients.jsonl"
+
+            self._write_jsonl(output_file, (
+                entry.get("resource", {})
+                for result in results if result.fhir_data
+                for entry in result.fhir_data.entries
+            ))
+
+            saved_path = str(output_file)
+            for result in results:
+                if result.fhir_data:
+                    result.saved_path = saved_path
+
+            print(f"\n💾 Saved combined FHIR resources to: {output_file}")
+            return saved_path
+
+        except Exception as e:
+            print(f"Error saving combined FHIR resources: {e}")
+            return None
+
 
 # Convenience function
 def generate_fhir_from_journey(
@@ -1740,6 +3171,11 @@ def generate_fhir_from_journey(
     parallel_generation: bool = True,
     use_enhanced_context: bool = True,
     llm_provider: Optional[str] = None,
+    auto_save: bool = True,
+    save_directory: str = "output",
+    cache_directory: Optional[str] = None,
+    max_concurrent_requests: int = 10,
+    requests_per_minute: Optional[int] = None,
 ) -> GenerationResult:
     """
     Convenience function to generate FHIR resources from a patient journey.
@@ -1757,6 +3193,12 @@ def generate_fhir_from_journey(
         parallel_generation: Use parallel generation for faster results (default: True)
         use_enhanced_context: Use enhanced context with valuesets, profiles, etc. (default: True, recommended)
         llm_provider: LLM provider to use ("openai" or "groq", defaults to LLM_PROVIDER env var or "openai")
+        auto_save: Save the generated bundle to save_directory/firstname_lastname/ (default: True)
+        save_directory: Base directory for auto-saved bundles (default: "output")
+        cache_directory: Optional directory for an on-disk cache of LLM responses, so re-runs of the
+            same journey replay cached responses instead of calling the API (default: None)
+        max_concurrent_requests: Maximum number of LLM requests in flight at once (default: 10)
+        requests_per_minute: Optional cap on LLM requests started per minute, e.g. the provider's RPM limit (default: None)
 
     Returns:
         GenerationResult with generated resources and validation status
@@ -1772,5 +3214,114 @@ def generate_fhir_from_journey(
         parallel_generation=parallel_generation,
         use_enhanced_context=use_enhanced_context,
         llm_provider=llm_provider,
+        auto_save=auto_save,
+        save_directory=save_directory,
+        cache_directory=cache_directory,
+        max_concurrent_requests=max_concurrent_requests,
+        requests_per_minute=requests_per_minute,
     )
     return agent.generate_from_journey(journey, patient_context)
+
+
+async def agenerate_fhir_from_journey(
+    journey: PatientJourney,
+    patient_context: Optional[str] = None,
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    fhir_version: Literal["R4", "R4B", "R5", "STU3"] = "R4",
+    max_iterations: int = 5,
+    max_fix_retries: int = 3,
+    fhir_schema_path: Optional[str] = None,
+    fhir_data_directory: Optional[str] = None,
+    parallel_generation: bool = True,
+    use_enhanced_context: bool = True,
+    llm_provider: Optional[str] = None,
+    auto_save: bool = True,
+    save_directory: str = "output",
+    cache_directory: Optional[str] = None,
+    max_concurrent_requests: int = 10,
+    requests_per_minute: Optional[int] = None,
+) -> GenerationResult:
+    """
+    Async version of generate_fhir_from_journey.
+
+    Takes the same arguments as generate_fhir_from_journey.
+
+    Returns:
+        GenerationResult with generated resources and validation status
+    """
+    agent = AIJourneyToFHIR(
+        api_key=api_key,
+        model=model,
+        fhir_version=fhir_version,
+        max_iterations=max_iterations,
+        max_fix_retries=max_fix_retries,
+        fhir_schema_path=fhir_schema_path,
+        fhir_data_directory=fhir_data_directory,
+        parallel_generation=parallel_generation,
+        use_enhanced_context=use_enhanced_context,
+        llm_provider=llm_provider,
+        auto_save=auto_save,
+        save_directory=save_directory,
+        cache_directory=cache_directory,
+        max_concurrent_requests=max_concurrent_requests,
+        requests_per_minute=requests_per_minute,
+    )
+    try:
+        return await agent.agenerate_from_journey(journey, patient_context)
+    finally:
+        await agent.aclose()
+
+
+def generate_fhir_from_journeys_batch(
+    journeys: List[PatientJourney],
+    patient_contexts: Optional[List[Optional[str]]] = None,
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    fhir_version: Literal["R4", "R4B", "R5", "STU3"] = "R4",
+    max_fix_retries: int = 3,
+    fhir_schema_path: Optional[str] = None,
+    fhir_data_directory: Optional[str] = None,
+    use_enhanced_context: bool = True,
+    llm_provider: Optional[str] = None,
+    poll_interval: float = 30.0,
+    auto_save: bool = True,
+    save_directory: str = "output",
+    combined_save: bool = False,
+) -> List[GenerationResult]:
+    """
+    Convenience function to generate FHIR resources for many journeys via the Batch API.
+
+    Args:
+        journeys: PatientJourneys to convert
+        patient_contexts: Optional additional context per journey (same order as journeys)
+        api_key: API key for the LLM provider (defaults to OPENAI_API_KEY or GROQ_API_KEY env var based on provider)
+        model: Model to use (e.g., "gpt-4o-mini" for OpenAI, "openai/gpt-oss-120b" for Groq)
+        fhir_version: FHIR version to generate
+        max_fix_retries: Maximum number of attempts to fix validation errors per resource
+        fhir_schema_path: Optional path to fhir.schema.json file (legacy)
+        fhir_data_directory: Optional path to directory containing all FHIR data files (recommended)
+        use_enhanced_context: Use enhanced context with valuesets, profiles, etc. (default: True, recommended)
+        llm_provider: LLM provider to use ("openai" or "groq", defaults to LLM_PROVIDER env var or "openai")
+        poll_interval: Seconds to wait between batch status checks
+        auto_save: Save each generated bundle to save_directory/firstname_lastname/ (default: True)
+        save_directory: Base directory for auto-saved bundles (default: "output")
+        combined_save: Write all resources to save_directory/all_patients.jsonl instead of per-patient folders
+
+    Returns:
+        List of GenerationResult, in the same order as journeys
+    """
+    agent = AIJourneyToFHIR(
+        api_key=api_key,
+        model=model,
+        fhir_version=fhir_version,
+        max_fix_retries=max_fix_retries,
+        fhir_schema_path=fhir_schema_path,
+        fhir_data_directory=fhir_data_directory,
+        use_enhanced_context=use_enhanced_context,
+        llm_provider=llm_provider,
+        auto_save=auto_save,
+        save_directory=save_directory,
+    )
+    return agent.generate_from_journeys_batch(
+        journeys, patient_contexts, poll_interval=poll_interval, combined_save=combined_save)
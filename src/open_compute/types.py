@@ -1,6 +1,11 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Literal, Mapping
 
+# Journey types are created in bulk; store their fields in slots instead of
+# a per-instance __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 @dataclass
 class FHIRPatientData:
@@ -8,15 +13,17 @@ class FHIRPatientData:
     entries: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class JourneyStage:
+    """One step of a patient journey (plain dataclass, no validation on construction)."""
     name: str
     description: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PatientJourney:
+    """A patient's journey as an ordered list of stages."""
     patient_id: Optional[str]
     stages: List[JourneyStage] = field(default_factory=list)
     summary: Optional[str] = None
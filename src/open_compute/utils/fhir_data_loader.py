@@ -34,6 +34,8 @@ class FHIRDataLoader:
         self.resource_profiles = None
         self.type_profiles = None
         self.search_parameters = None
+        # Formatted prompt contexts by (resource_type, max_examples)
+        self._prompt_contexts: Dict[tuple, str] = {}
         self._load_all_data()
 
     def _find_data_directory(self) -> Optional[Path]:
@@ -324,6 +326,10 @@ class FHIRDataLoader:
         if not self.schema:
             return "Note: FHIR data not loaded. Please ensure proper FHIR structure."
 
+        key = (resource_type, max_examples)
+        if key in self._prompt_contexts:
+            return self._prompt_contexts[key]
+
         lines = [f"=== FHIR {resource_type} Reference Data ===", ""]
 
         # 1. Basic description from schema
@@ -387,20 +393,27 @@ class FHIRDataLoader:
                             lines.append(f"  - {prop}: {prop_desc}")
                             shown += 1
 
-        return "\n".join(lines)
+        context = "\n".join(lines)
+        self._prompt_contexts[key] = context
+        return context
 
     def is_loaded(self) -> bool:
         """Check if data is successfully loaded."""
         return self.schema is not None
 
 
-# Global instance for easy access
-_global_loader: Optional[FHIRDataLoader] = None
+@lru_cache(maxsize=8)
+def _load_data_loader(data_directory: Optional[str]) -> FHIRDataLoader:
+    """Create a FHIRDataLoader for a directory, loading its files only once."""
+    return FHIRDataLoader(data_directory)
 
 
 def get_data_loader(data_directory: Optional[str] = None) -> FHIRDataLoader:
     """
-    Get or create the global FHIR data loader instance.
+    Get or create the shared FHIR data loader for a data directory.
+
+    Loaders are cached per directory, so the (large) FHIR data files are
+    parsed once per process no matter how many agents request them.
 
     Args:
         data_directory: Optional path to data directory
@@ -408,7 +421,6 @@ def get_data_loader(data_directory: Optional[str] = None) -> FHIRDataLoader:
     Returns:
         FHIRDataLoader instance
     """
-    global _global_loader
-    if _global_loader is None or data_directory:
-        _global_loader = FHIRDataLoader(data_directory)
-    return _global_loader
+    if data_directory:
+        data_directory = str(Path(data_directory).resolve())
+    return _load_data_loader(data_directory)
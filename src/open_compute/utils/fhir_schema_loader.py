@@ -23,6 +23,8 @@ class FHIRSchemaLoader:
         """
         self.schema_path = schema_path
         self.schema = None
+        # Formatted prompt schemas by (resource_type, max_properties)
+        self._prompt_schemas: Dict[tuple, str] = {}
         self._load_schema()
 
     def _load_schema(self):
@@ -127,6 +129,10 @@ class FHIRSchemaLoader:
         if not definition:
             return f"Note: Schema definition for {resource_type} not found."
 
+        key = (resource_type, max_properties)
+        if key in self._prompt_schemas:
+            return self._prompt_schemas[key]
+
         lines = [f"FHIR {resource_type} Schema:"]
         lines.append("")
 
@@ -175,7 +181,9 @@ class FHIRSchemaLoader:
                             "..." if len(prop_desc) > 100 else prop_desc
                         lines.append(f"  - {prop}: {prop_desc}")
 
-        return "\n".join(lines)
+        schema = "\n".join(lines)
+        self._prompt_schemas[key] = schema
+        return schema
 
     def get_example_structure(self, resource_type: str) -> str:
         """
@@ -225,13 +233,22 @@ class FHIRSchemaLoader:
         return self.schema is not None
 
 
-# Global instance for easy access
-_global_loader: Optional[FHIRSchemaLoader] = None
+@lru_cache(maxsize=4)
+def _load_schema_loader(schema_path: Optional[str], mtime: Optional[float]) -> FHIRSchemaLoader:
+    """Create a FHIRSchemaLoader for a schema file, parsing it only once.
+
+    ``mtime`` is only part of the cache key, so an edited schema is reloaded.
+    """
+    return FHIRSchemaLoader(schema_path)
 
 
 def get_schema_loader(schema_path: Optional[str] = None) -> FHIRSchemaLoader:
     """
-    Get or create the global FHIR schema loader instance.
+    Get or create the shared FHIR schema loader for a schema file.
+
+    Loaders are cached per resolved path and modification time, so the
+    (large) schema is parsed once per process no matter how many agents
+    request it.
 
     Args:
         schema_path: Optional path to schema file
@@ -239,7 +256,10 @@ def get_schema_loader(schema_path: Optional[str] = None) -> FHIRSchemaLoader:
     Returns:
         FHIRSchemaLoader instance
     """
-    global _global_loader
-    if _global_loader is None or schema_path:
-        _global_loader = FHIRSchemaLoader(schema_path)
-    return _global_loader
+    mtime = None
+    if schema_path:
+        schema_file = Path(schema_path).resolve()
+        schema_path = str(schema_file)
+        if schema_file.exists():
+            mtime = schema_file.stat().st_mtime
+    return _load_schema_loader(schema_path, mtime)
@@ -6,13 +6,23 @@ the FHIR specification using the fhir.resources library.
 """
 
 import json
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Union, Optional, Literal
+import re
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import (
+    Annotated, Dict, Any, FrozenSet, Iterable, List, Union, Optional, Literal, Tuple,
+    get_args, get_origin,
+)
 from pathlib import Path
 
+# Model modules (fhir.resources.patient, ...bundle, ...) define hundreds of
+# pydantic models; they are imported per type on first use through
+# _get_model_class rather than at import time.
 try:
     from fhir.resources import get_fhir_model_class
-    from fhir.resources.bundle import Bundle
+    from pydantic import TypeAdapter, ValidationError
 except ImportError:
     raise ImportError(
         "fhir.resources is required for FHIR validation. "
@@ -20,6 +30,93 @@ except ImportError:
     )
 
 
+@lru_cache(maxsize=256)
+def _get_model_class(resource_type: str):
+    """
+    Resolve the fhir.resources model class for a resource type, once per type.
+
+    Older fhir.resources releases resolve the class on every call, which
+    means a module lookup per validated resource.
+    """
+    return get_fhir_model_class(resource_type)
+
+
+@lru_cache(maxsize=256)
+def _get_list_adapter(resource_type: str) -> TypeAdapter:
+    """Build (once per type) a TypeAdapter validating a list of resources."""
+    return TypeAdapter(List[_get_model_class(resource_type)])
+
+
+@lru_cache(maxsize=256)
+def _get_code_values(resource_type: str) -> Dict[str, FrozenSet[str]]:
+    """Map the top-level code elements of a FHIR model to their closed value sets."""
+    code_values = {}
+    for name, info in _get_model_class(resource_type).model_fields.items():
+        values = (info.json_schema_extra or {}).get("enum_values")
+        if values and "+" not in values:
+            code_values[info.alias or name] = frozenset(values)
+    return code_values
+
+
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))
+
+# Complex types a model often writes as a bare string, and the element of the
+# type that string belongs in
+_STRING_WRAPPERS = {
+    "CodeableConceptType": "text",
+    "ReferenceType": "reference",
+    "AnnotationType": "text",
+}
+
+# A date (or the date part of a dateTime) without zero-padded month or day
+_UNPADDED_DATE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(T.*)?$")
+
+
+def _element_type(annotation: Any) -> Tuple[str, bool]:
+    """Reduce a model field annotation to (FHIR type name, is a list)."""
+    is_list = False
+    while True:
+        origin = get_origin(annotation)
+        if origin in _UNION_ORIGINS:
+            annotation = next(
+                arg for arg in get_args(annotation) if arg is not type(None))
+        elif origin is list:
+            is_list = True
+            annotation = get_args(annotation)[0]
+        elif origin is Annotated:
+            # Primitives are annotated with their FHIR type (Date(), Code(), ...)
+            return type(annotation.__metadata__[0]).__name__, is_list
+        else:
+            return getattr(annotation, "__name__", ""), is_list
+
+
+@lru_cache(maxsize=256)
+def _get_element_types(resource_type: str) -> Dict[str, Tuple[str, bool]]:
+    """Map the top-level elements of a FHIR model to (type name, is a list)."""
+    return {
+        info.alias or name: _element_type(info.annotation)
+        for name, info in _get_model_class(resource_type).model_fields.items()
+    }
+
+
+def _repair_value(type_name: str, value: Any) -> Any:
+    """Repair one element value for repair(); returns the value unchanged if it cannot."""
+    if not isinstance(value, str):
+        return value
+
+    key = _STRING_WRAPPERS.get(type_name)
+    if key:
+        return {key: value}
+
+    if type_name in ("Date", "DateTime"):
+        match = _UNPADDED_DATE.match(value)
+        if match:
+            year, month, day, time = match.groups()
+            return f"{year}-{int(month):02d}-{int(day):02d}{time or ''}"
+
+    return value
+
+
 class FHIRValidationError(Exception):
     """Custom exception for FHIR validation errors."""
     pass
@@ -31,7 +128,8 @@ class ValidationResult:
     is_valid: bool
     errors: List[str] = field(default_factory=list)
     resource_type: Optional[str] = None
-    validated_resource: Optional[Any] = None
+    # Left out of repr(): a model's repr walks every (mostly None) element
+    validated_resource: Optional[Any] = field(default=None, repr=False)
 
     def __str__(self) -> str:
         if self.is_valid:
@@ -102,16 +200,24 @@ class FHIRValidator:
 
     Attributes:
         version: FHIR version to validate against (R4, R4B, R5, STU3)
+        cache_size: Number of recent validation results kept in memory
     """
 
-    def __init__(self, version: Literal["R4", "R4B", "R5", "STU3"] = "R4"):
+    def __init__(
+        self,
+        version: Literal["R4", "R4B", "R5", "STU3"] = "R4",
+        cache_size: int = 128,
+    ):
         """
         Initialize the FHIR validator.
 
         Args:
             version: FHIR version to validate against
+            cache_size: Number of recent validation results to keep (0 disables caching)
         """
         self.version = version
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, ValidationResult]" = OrderedDict()
 
     def validate(
         self,
@@ -121,6 +227,139 @@ class FHIRValidator:
         """
         Validate a FHIR resource.
 
+        Results are cached by resource content, so validating an identical
+        resource again (e.g. the same resource across iterations or journeys)
+        returns the previous result without re-running model validation.
+        Building the cache key serializes a dict resource once with
+        json.dumps(sort_keys=True), on misses as well as hits. Each hit
+        returns a copy with its own errors list, so callers can modify the
+        result they get back without affecting the cached entry.
+
+        Args:
+            resource: FHIR resource as dict or JSON string
+            resource_type: Optional resource type to validate against
+
+        Returns:
+            ValidationResult with validation status and any errors
+        """
+        key = self._cache_key(resource, resource_type)
+        if key is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            cached = self._cache[key]
+            return replace(cached, errors=list(cached.errors))
+
+        result = self._validate_uncached(resource, resource_type)
+
+        if key is not None:
+            self._cache[key] = replace(result, errors=list(result.errors))
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def clear_cache(self):
+        """Drop all cached validation results."""
+        self._cache.clear()
+
+    def warmup(self, resource_types: Iterable[str]) -> None:
+        """
+        Load the model classes for resource types ahead of their first validation.
+
+        The first model import also loads the shared FHIR data types, which
+        makes an application's first validation by far its slowest. Calling
+        this while waiting on something else (e.g. an LLM request) takes that
+        cost off the critical path. Unknown resource types are skipped.
+
+        Args:
+            resource_types: FHIR resource types to prepare
+        """
+        for resource_type in resource_types:
+            try:
+                _get_model_class(resource_type)
+            except Exception:
+                continue
+
+    def repair(self, resource: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Repair common structural mistakes in a resource without an LLM.
+
+        Only unambiguous top-level fixes are made: a bare string given for a
+        CodeableConcept, Reference or Annotation is wrapped (as its text or
+        reference), a single value given for a list is put in one, unpadded
+        dates are zero-padded and codes are matched case-insensitively against
+        closed value sets. The resource itself is not modified.
+
+        Args:
+            resource: FHIR resource as dict
+
+        Returns:
+            Repaired copy of the resource, or None if nothing could be repaired
+        """
+        try:
+            element_types = _get_element_types(resource.get("resourceType"))
+            code_values = _get_code_values(resource.get("resourceType"))
+        except Exception:
+            return None
+
+        repaired = dict(resource)
+        for element, value in resource.items():
+            if element not in element_types:
+                continue
+            type_name, is_list = element_types[element]
+
+            if is_list and isinstance(value, list):
+                new_value = [_repair_value(type_name, item) for item in value]
+            elif is_list:
+                item = _repair_value(type_name, value)
+                # Wrapping helps only if the element itself is well-formed
+                new_value = [item] if isinstance(item, dict) else value
+            else:
+                new_value = _repair_value(type_name, value)
+
+            codes = code_values.get(element)
+            if codes and isinstance(value, str) and value not in codes:
+                by_lower = {code.lower(): code for code in codes}
+                new_value = by_lower.get(value.strip().lower(), value)
+
+            if new_value != value:
+                repaired[element] = new_value
+
+        return repaired if repaired != resource else None
+
+    def _cache_key(
+        self,
+        resource: Union[Dict[str, Any], str],
+        resource_type: Optional[str],
+    ) -> Optional[tuple]:
+        """
+        Build the cache key for a resource, or None if it should not be cached.
+
+        The key holds the FHIR version, the requested resource type and the
+        canonical JSON of the resource, so resources only share a cached
+        result when their content is identical. Serializing a dict resource
+        costs one json.dumps(sort_keys=True) per call.
+        """
+        if self.cache_size <= 0:
+            return None
+
+        if isinstance(resource, str):
+            canonical = resource
+        else:
+            try:
+                canonical = json.dumps(resource, sort_keys=True)
+            except (TypeError, ValueError):
+                return None
+
+        return (self.version, resource_type, canonical)
+
+    def _validate_uncached(
+        self,
+        resource: Union[Dict[str, Any], str],
+        resource_type: Optional[str] = None,
+    ) -> ValidationResult:
+        """
+        Validate a FHIR resource without consulting the cache.
+
         Args:
             resource: FHIR resource as dict or JSON string
             resource_type: Optional resource type to validate against
@@ -132,7 +371,9 @@ class FHIRValidator:
         validated_resource = None
 
         try:
-            # Parse JSON string if needed
+            # Parse JSON string if needed. The dict is needed anyway to detect
+            # resourceType (model_validate_json accepts a missing one), and
+            # parsing is a small fraction of fhir.resources validation time.
             if isinstance(resource, str):
                 try:
                     resource = json.loads(resource)
@@ -166,7 +407,7 @@ class FHIRValidator:
             # Validate using fhir.resources
             try:
                 # Get the appropriate FHIR model class
-                model_class = get_fhir_model_class(resource_type)
+                model_class = _get_model_class(resource_type)
 
                 # Parse and validate the resource using model_validate (Pydantic v2)
                 validated_resource = model_class.model_validate(resource)
@@ -222,12 +463,73 @@ class FHIRValidator:
                 errors=[f"Error reading file: {str(e)}"],
             )
 
+    def _validate_entries(self, resources: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate bundle entry resources, one pydantic call per resource type.
+
+        Resources are grouped by resourceType and each group is validated as
+        a list through a cached TypeAdapter. Entries reported invalid are then
+        validated individually to produce their error messages.
+
+        Args:
+            resources: Entry resources of a bundle
+
+        Returns:
+            ValidationResult per resource (same order as input)
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(resources)
+
+        groups: Dict[str, List[int]] = {}
+        for idx, resource in enumerate(resources):
+            resource_type = resource.get(
+                "resourceType") if isinstance(resource, dict) else None
+            if resource_type:
+                groups.setdefault(resource_type, []).append(idx)
+            else:
+                results[idx] = self.validate(resource)
+
+        for resource_type, indices in groups.items():
+            invalid = []
+            try:
+                adapter = _get_list_adapter(resource_type)
+                try:
+                    models = adapter.validate_python(
+                        [resources[idx] for idx in indices])
+                except ValidationError as e:
+                    failed = {
+                        indices[error["loc"][0]]
+                        for error in e.errors()
+                        if error["loc"] and isinstance(error["loc"][0], int)
+                    } or set(indices)
+                    invalid = [idx for idx in indices if idx in failed]
+                    indices = [idx for idx in indices if idx not in failed]
+                    models = adapter.validate_python(
+                        [resources[idx] for idx in indices]) if indices else []
+            except Exception:
+                # Unknown type or unexpected failure: validate one by one
+                invalid, indices, models = invalid + indices, [], []
+
+            for idx, model in zip(indices, models):
+                results[idx] = ValidationResult(
+                    is_valid=True,
+                    errors=[],
+                    resource_type=resource_type,
+                    validated_resource=model,
+                )
+            for idx in invalid:
+                results[idx] = self.validate(resources[idx])
+
+        return results
+
     def validate_bundle(
         self, bundle: Union[Dict[str, Any], str]
     ) -> BundleValidationResult:
         """
         Validate a FHIR Bundle and all its entries.
 
+        Entries are validated on their own only when the Bundle as a whole
+        is invalid, to find which entries the errors belong to.
+
         Args:
             bundle: FHIR Bundle as dict or JSON string
 
@@ -255,15 +557,30 @@ class FHIRValidator:
 
             # Validate each entry
             entries = bundle.get("entry", [])
-            for idx, entry in enumerate(entries):
-                resource = entry.get("resource", {})
-                resource_type = resource.get("resourceType", "Unknown")
-
-                entry_validation = self.validate(resource)
+            resources = [entry.get("resource", {}) for entry in entries]
+            if bundle_validation.is_valid and all(
+                isinstance(resource, dict) and resource.get("resourceType")
+                for resource in resources
+            ):
+                # The Bundle model validates every entry's resource, so a valid
+                # Bundle already holds the validated entry models
+                entry_validations = [
+                    ValidationResult(
+                        is_valid=True,
+                        errors=[],
+                        resource_type=resource["resourceType"],
+                        validated_resource=entry.resource,
+                    )
+                    for resource, entry in zip(
+                        resources, bundle_validation.validated_resource.entry or [])
+                ]
+            else:
+                entry_validations = self._validate_entries(resources)
+            for idx, (resource, entry_validation) in enumerate(zip(resources, entry_validations)):
                 entry_results.append(
                     {
                         "index": idx,
-                        "resource_type": resource_type,
+                        "resource_type": resource.get("resourceType", "Unknown"),
                         "result": entry_validation,
                     }
                 )
@@ -287,6 +604,12 @@ class FHIRValidator:
             )
 
 
+@lru_cache(maxsize=None)
+def _get_default_validator(version: str) -> FHIRValidator:
+    """Get the shared validator used by validate_fhir_resource for a FHIR version."""
+    return FHIRValidator(version=version)
+
+
 def validate_fhir_resource(
     resource: Union[Dict[str, Any], str],
     version: Literal["R4", "R4B", "R5", "STU3"] = "R4",
@@ -303,5 +626,5 @@ def validate_fhir_resource(
     Returns:
         ValidationResult with validation status and any errors
     """
-    validator = FHIRValidator(version=version)
+    validator = _get_default_validator(version)
     return validator.validate(resource, resource_type=resource_type)
@@ -7,16 +7,26 @@ Note: These tests will make actual API calls to OpenAI if OPENAI_API_KEY is set.
 Consider using mocks for CI/CD environments.
 """
 
+import gc
 import os
+import sys
+import asyncio
+import subprocess
+import threading
+import time
+import weakref
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import json
+from pathlib import Path
 
 from open_compute import (
+    FHIRPatientData,
     PatientJourney,
     JourneyStage,
     AIJourneyToFHIR,
     generate_fhir_from_journey,
+    agenerate_fhir_from_journey,
     GenerationResult,
     GenerationPlan,
 )
@@ -109,6 +119,16 @@ class TestAIJourneyToFHIR:
         assert agent.fhir_version == "R4B"
         assert agent.max_iterations == 10
 
+    def test_package_import_defers_openai(self):
+        """Test that importing the package does not load the OpenAI SDK."""
+        code = (
+            "import sys, open_compute\n"
+            "assert 'openai' not in sys.modules\n"
+            "assert open_compute.AIJourneyToFHIR is not None\n"
+            "assert 'openai' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
     def test_format_journey_for_prompt(self, simple_journey):
         """Test formatting a journey for prompts."""
         agent = AIJourneyToFHIR(api_key="test-key")
@@ -119,6 +139,21 @@ class TestAIJourneyToFHIR:
         assert "Registration" in formatted
         assert "Triage" in formatted
 
+    def test_journey_description_is_formatted_once_per_run(self, simple_journey):
+        """Test that a run reuses one formatted journey text and drops it afterwards."""
+        agent = AIJourneyToFHIR(api_key="test-key")
+
+        with agent._journey_descriptions_for([simple_journey]):
+            description = agent._format_journey_for_prompt(simple_journey)
+            assert agent._format_journey_for_prompt(simple_journey) is description
+            # A nested run leaves the outer run's entry in place
+            with agent._journey_descriptions_for([simple_journey]):
+                pass
+            assert agent._format_journey_for_prompt(simple_journey) is description
+
+        assert agent._journey_descriptions == {}
+        assert agent._format_journey_for_prompt(simple_journey) == description
+
     def test_format_existing_resources(self):
         """Test formatting existing resources."""
         agent = AIJourneyToFHIR(api_key="test-key")
@@ -138,6 +173,76 @@ class TestAIJourneyToFHIR:
         formatted = agent._format_existing_resources([])
         assert "None yet" in formatted
 
+    def test_compact_context(self):
+        """Test that multi-line context is collapsed to a single line."""
+        context = """
+        Patient is a 55-year-old male.
+            History of hypertension.
+        """
+        assert AIJourneyToFHIR._compact_context(context) == \
+            "Patient is a 55-year-old male. History of hypertension."
+        assert AIJourneyToFHIR._compact_context(None) is None
+
+    def test_generation_prompts_share_journey_prefix(self, simple_journey):
+        """Test that prompts for one journey start with the same journey block."""
+        agent = AIJourneyToFHIR(api_key="test-key")
+        id_map = {"Patient": "pat-1", "Observation": "obs-1"}
+        patient = {"resourceType": "Patient", "assigned_id": "pat-1"}
+        observation = {"resourceType": "Observation", "assigned_id": "obs-1"}
+
+        first = agent._build_generation_messages(
+            patient, simple_journey, [], "Extra context", id_map)
+        second = agent._build_generation_messages(
+            observation, simple_journey, [{"resourceType": "Patient", "id": "pat-1"}],
+            "Extra context", id_map)
+        group = agent._build_group_generation_messages(
+            [patient, observation], simple_journey, [], "Extra context", id_map)
+
+        prefix = agent._format_journey_context(
+            simple_journey, "Extra context", id_map)
+        assert "Extra context" in prefix and "obs-1" in prefix
+        for messages in (first, second, group):
+            assert messages[1]["content"].startswith(prefix + "\n\n---")
+        assert agent._get_resource_context("Observation") in second[1]["content"]
+        assert first[0] == second[0] == group[0]
+
+    def test_fix_prompts_lead_with_journey_and_schema(self, simple_journey):
+        """Test that fix prompts put the shared blocks before the invalid resource."""
+        from open_compute.utils.fhir_validator import ValidationResult
+
+        agent = AIJourneyToFHIR(api_key="test-key")
+        id_map = {"Observation": "obs-1"}
+        spec = {"resourceType": "Observation", "assigned_id": "obs-1"}
+        prompts = [
+            agent._build_fix_prompt(
+                {"resourceType": "Observation", "status": status},
+                ValidationResult(is_valid=False, errors=[f"bad {status}"],
+                                 resource_type="Observation"),
+                spec, simple_journey, [], "Extra context", id_map)
+            for status in ("foo", "bar")
+        ]
+
+        prefix = (agent._format_journey_context(simple_journey, "Extra context", id_map)
+                  + "\n\n---\n\n" + agent._get_schema_context("Observation"))
+        for prompt in prompts:
+            assert prompt.startswith(prefix)
+            assert prompt.index("ORIGINAL RESOURCE") > len(prefix)
+
+    def test_record_usage_counts_cached_prompt_tokens(self):
+        """Test that prompt cache hits reported by the provider are counted."""
+        agent = AIJourneyToFHIR(api_key="test-key")
+        response = MagicMock()
+        response.usage.prompt_tokens = 2000
+        response.usage.prompt_tokens_details.cached_tokens = 1536
+
+        agent._record_usage(response)
+        agent._record_usage(response)
+        agent._record_usage(MagicMock(usage=None))
+
+        assert agent.usage.prompt_tokens == 4000
+        assert agent.usage.cached_tokens == 3072
+        assert agent.usage.cache_hit_rate == 0.768
+
     def test_create_bundle(self):
         """Test creating a FHIR bundle from resources."""
         agent = AIJourneyToFHIR(api_key="test-key")
@@ -264,9 +369,11 @@ class TestGenerationWithMocks:
 
     @pytest.fixture
     def mock_openai_client(self):
-        """Fixture providing a mocked OpenAI client."""
-        with patch("open_compute.agents.ai_journey_to_fhir.OpenAI") as mock:
+        """Fixture providing a mocked AsyncOpenAI client."""
+        with patch("open_compute.agents.ai_journey_to_fhir.AsyncOpenAI") as mock:
             client = MagicMock()
+            client.chat.completions.create = AsyncMock()
+            client.close = AsyncMock()
             mock.return_value = client
             yield client
 
@@ -294,7 +401,7 @@ class TestGenerationWithMocks:
         mock_openai_client.chat.completions.create.return_value = mock_response
 
         agent = AIJourneyToFHIR(api_key="test-key")
-        plan = agent._create_generation_plan(simple_journey)
+        plan = asyncio.run(agent._create_generation_plan_async(simple_journey))
 
         assert isinstance(plan, GenerationPlan)
         assert len(plan.resources_to_generate) == 2
@@ -322,9 +429,9 @@ class TestGenerationWithMocks:
             "key_data": ["patient_id"],
         }
 
-        resource = agent._generate_single_resource(
+        resource = asyncio.run(agent._generate_single_resource_async(
             resource_spec, simple_journey, [], None
-        )
+        ))
 
         assert resource is not None
         assert resource["resourceType"] == "Patient"
@@ -348,9 +455,9 @@ class TestGenerationWithMocks:
                      {"resourceType": "Encounter"}]
         journey_description = agent._format_journey_for_prompt(simple_journey)
 
-        result = agent._check_completeness(
+        result = asyncio.run(agent._check_completeness_async(
             simple_journey, resources, journey_description, None
-        )
+        ))
 
         assert result["is_complete"] is True
         assert "reasoning" in result
@@ -378,15 +485,736 @@ class TestGenerationWithMocks:
         resources = [{"resourceType": "Patient"}]
         journey_description = agent._format_journey_for_prompt(simple_journey)
 
-        result = agent._check_completeness(
+        result = asyncio.run(agent._check_completeness_async(
             simple_journey, resources, journey_description, None
-        )
+        ))
 
         assert result["is_complete"] is False
         assert len(result["additional_resources"]) == 1
         assert result["additional_resources"][0]["resourceType"] == "Observation"
 
 
+def _mock_response(content):
+    """Build a mocked chat completion response with JSON content."""
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps(content)
+    return response
+
+
+class TestAsyncGeneration:
+    """Test the async generation workflow with a mocked AsyncOpenAI client."""
+
+    @pytest.fixture
+    def mock_async_client(self):
+        """Fixture providing a mocked AsyncOpenAI client that answers by prompt type."""
+        plan = {
+            "rationale": "Patient and Observation",
+            "resources": [
+                {"resourceType": "Patient", "description": "Demographics"},
+                {"resourceType": "Observation", "description": "Chief complaint"},
+            ],
+        }
+        resources = {
+            "Patient": {"name": [{"family": "Doe", "given": ["John"]}]},
+            "Observation": {
+                "status": "final",
+                "code": {"text": "Headache"},
+            },
+        }
+
+        async def create(**kwargs):
+            system = kwargs["messages"][0]["content"]
+            user = kwargs["messages"][1]["content"]
+            if "comprehensive plans" in system:
+                return _mock_response(plan)
+            if "assesses completeness" in system:
+                return _mock_response({"is_complete": True, "reasoning": "Done"})
+            resource_type = user.split("Resource to Generate: ")[1].split("\n")[0]
+            return _mock_response(dict(resources[resource_type]))
+
+        with patch("open_compute.agents.ai_journey_to_fhir.AsyncOpenAI") as mock:
+            client = MagicMock()
+            client.chat.completions.create = AsyncMock(side_effect=create)
+            client.close = AsyncMock()
+            mock.return_value = client
+            yield client
+
+    def test_agenerate_from_journey(self, simple_journey, mock_async_client):
+        """Test that the coroutine generates every planned resource."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", max_iterations=2, auto_save=False)
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert result.success is True
+        assert result.iterations == 1
+        assert sorted(r["resourceType"] for r in result.generated_resources) == [
+            "Observation", "Patient"]
+        # plan + 2 resources + completeness check
+        assert mock_async_client.chat.completions.create.await_count == 4
+
+    def test_unchanged_resources_reuse_completeness_result(self, simple_journey, mock_async_client):
+        """Test that a check with no new resources since the last one is not sent again."""
+        create = mock_async_client.chat.completions.create.side_effect
+        checks = []
+
+        async def create_with_failing_condition(**kwargs):
+            system = kwargs["messages"][0]["content"]
+            user = kwargs["messages"][1]["content"]
+            if "assesses completeness" in system:
+                checks.append(user)
+                return _mock_response({
+                    "is_complete": False,
+                    "additional_resources": [
+                        {"resourceType": "Condition", "description": "Migraine"}],
+                })
+            if "fixes validation errors" in system or "Resource to Generate: Condition" in user:
+                # Missing subject: fails validation, and so does every fix
+                return _mock_response({"code": {"text": "Migraine"}})
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = create_with_failing_condition
+        agent = AIJourneyToFHIR(
+            api_key="test-key", max_iterations=3, auto_save=False)
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert result.success is False
+        assert result.iterations == 3
+        assert len(checks) == 1
+
+    def test_agent_is_released_after_a_run(self, simple_journey, mock_async_client):
+        """Test that no module-level cache keeps an agent alive after it is used."""
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+        assert result.success is True
+        agent_ref = weakref.ref(agent)
+
+        del agent
+        gc.collect()
+
+        assert agent_ref() is None
+
+    def test_planned_types_are_warmed_up(self, simple_journey, mock_async_client, monkeypatch):
+        """Test that planned types outside the common set get their models loaded."""
+        monkeypatch.setattr(
+            "open_compute.agents.ai_journey_to_fhir._COMMON_RESOURCE_TYPES", ("Patient",))
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        calls = []
+        monkeypatch.setattr(agent.validator, "warmup",
+                            lambda types: calls.append(list(types)))
+
+        asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert calls == [["Patient"], ["Observation"]]
+
+    def test_usage_is_counted_per_journey(self, simple_journey, mock_async_client):
+        """Test that each result reports the tokens of its own journey."""
+        create = mock_async_client.chat.completions.create.side_effect
+
+        async def create_with_usage(**kwargs):
+            response = await create(**kwargs)
+            response.usage.prompt_tokens = 100
+            response.usage.completion_tokens = 10
+            response.usage.prompt_tokens_details.cached_tokens = 50
+            return response
+
+        mock_async_client.chat.completions.create.side_effect = create_with_usage
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+
+        async def run_both():
+            return await asyncio.gather(
+                agent.agenerate_from_journey(simple_journey),
+                agent.agenerate_from_journey(simple_journey),
+            )
+
+        results = asyncio.run(run_both())
+
+        calls = mock_async_client.chat.completions.create.await_count
+        for result in results:
+            assert result.usage.prompt_tokens == 100 * calls // 2
+            assert result.usage.completion_tokens == 10 * calls // 2
+            assert result.usage.cache_hit_rate == 0.5
+        assert agent.usage.prompt_tokens == 100 * calls
+
+    def test_trust_plan_skips_completeness_check(self, simple_journey, mock_async_client):
+        """Test that trust_plan saves the completeness call when the plan succeeded."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", max_iterations=2, auto_save=False, trust_plan=True)
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert result.success is True
+        assert result.iterations == 1
+        # plan + 2 resources, no completeness check
+        assert mock_async_client.chat.completions.create.await_count == 3
+
+    def test_auto_save_runs_off_the_event_loop(self, simple_journey, mock_async_client, tmp_path):
+        """Test that the bundle is saved in a worker thread, not on the loop."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", max_iterations=2, save_directory=str(tmp_path))
+        save_bundle = agent._save_bundle
+        save_threads = []
+
+        def record_thread(fhir_data, journey):
+            save_threads.append(threading.get_ident())
+            return save_bundle(fhir_data, journey)
+
+        agent._save_bundle = record_thread
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert result.saved_path is not None
+        assert (Path(result.saved_path) / "patient_bundle.json").exists()
+        assert len(save_threads) == 1
+        assert save_threads[0] != threading.get_ident()
+
+    def test_parallel_generation_failure_is_isolated(self, simple_journey, mock_async_client):
+        """Test that one failed resource pipeline does not sink the others."""
+        create = mock_async_client.chat.completions.create.side_effect
+
+        async def failing_create(**kwargs):
+            if "Resource to Generate: Observation" in kwargs["messages"][1]["content"]:
+                raise RuntimeError("API unavailable")
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = failing_create
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", max_iterations=1, auto_save=False)
+        result = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert [r["resourceType"] for r in result.generated_resources] == [
+            "Patient"]
+
+    def test_concurrent_requests_are_bounded(self, simple_journey, mock_async_client):
+        """Test that no more than max_concurrent_requests calls are in flight."""
+        create = mock_async_client.chat.completions.create.side_effect
+        in_flight = {"current": 0, "peak": 0}
+
+        async def slow_create(**kwargs):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = slow_create
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, max_concurrent_requests=2)
+        specs = [{"resourceType": "Patient"} for _ in range(5)]
+        asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert in_flight["peak"] == 2
+
+    def test_requests_are_spaced_by_rate_limit(self, simple_journey, mock_async_client):
+        """Test that requests_per_minute spaces out request starts."""
+        starts = []
+        create = mock_async_client.chat.completions.create.side_effect
+
+        async def timed_create(**kwargs):
+            starts.append(time.monotonic())
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = timed_create
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, requests_per_minute=1200)
+        specs = [{"resourceType": "Patient"} for _ in range(4)]
+        asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert len(starts) == 4
+        assert min(gaps) >= 0.045
+
+    def test_grouped_generation_shares_one_request(self, simple_journey, mock_async_client):
+        """Test that resources_per_request packs several specs into one call."""
+        create = mock_async_client.chat.completions.create.side_effect
+
+        async def grouped_create(**kwargs):
+            if "Resources to Generate (2)" in kwargs["messages"][1]["content"]:
+                return _mock_response({"resources": [
+                    {"name": [{"family": "Doe"}]},
+                    {"status": "final", "code": {"text": "Headache"}},
+                ]})
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = grouped_create
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, resources_per_request=2)
+        specs = [
+            {"resourceType": "Patient", "assigned_id": "patient-1"},
+            {"resourceType": "Observation", "assigned_id": "obs-1"},
+        ]
+        outcomes = asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert [(o["resource"]["resourceType"], o["resource"]["id"]) for o in outcomes] == [
+            ("Patient", "patient-1"), ("Observation", "obs-1")]
+        assert mock_async_client.chat.completions.create.await_count == 1
+
+    def test_streamed_group_is_validated_while_streaming(self, simple_journey, mock_async_client):
+        """Test that stream_responses validates each resource as soon as it arrives."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, resources_per_request=2,
+            stream_responses=True)
+        validate = MagicMock(side_effect=agent.validator.validate)
+        agent.validator.validate = validate
+
+        content = json.dumps({"resources": [
+            {"name": [{"family": "Doe"}]},
+            {"status": "final", "code": {"text": "Headache"}},
+        ]})
+        split = content.index("}]}, {") + 3
+        validations_seen = []
+
+        async def chunks():
+            for piece in (content[:split], content[split:]):
+                chunk = MagicMock()
+                chunk.choices[0].delta.content = piece
+                yield chunk
+                await asyncio.sleep(0)
+                validations_seen.append(validate.call_count)
+
+        async def stream_create(**kwargs):
+            assert kwargs["stream"] is True
+            return chunks()
+
+        mock_async_client.chat.completions.create.side_effect = stream_create
+        specs = [
+            {"resourceType": "Patient", "assigned_id": "patient-1"},
+            {"resourceType": "Observation", "assigned_id": "obs-1"},
+        ]
+        outcomes = asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert [o["resource"]["id"] for o in outcomes] == ["patient-1", "obs-1"]
+        # The Patient was validated before the Observation had been streamed
+        assert validations_seen == [1, 2]
+        assert mock_async_client.chat.completions.create.await_count == 1
+
+    def test_streamed_group_records_usage(self, simple_journey, mock_async_client):
+        """Test that the usage sent at the end of a stream is counted."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, resources_per_request=2,
+            stream_responses=True)
+        content = json.dumps({"resources": [
+            {"name": [{"family": "Doe"}]},
+            {"status": "final", "code": {"text": "Headache"}},
+        ]})
+
+        async def chunks():
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = content
+            yield chunk
+            final = MagicMock(choices=[])
+            final.usage.prompt_tokens = 300
+            final.usage.completion_tokens = 40
+            final.usage.prompt_tokens_details.cached_tokens = 0
+            yield final
+
+        async def stream_create(**kwargs):
+            assert kwargs["stream_options"] == {"include_usage": True}
+            return chunks()
+
+        mock_async_client.chat.completions.create.side_effect = stream_create
+        specs = [
+            {"resourceType": "Patient", "assigned_id": "patient-1"},
+            {"resourceType": "Observation", "assigned_id": "obs-1"},
+        ]
+        asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert agent.usage.prompt_tokens == 300
+        assert agent.usage.completion_tokens == 40
+
+    def test_grouped_generation_retries_missing_resources(self, simple_journey, mock_async_client):
+        """Test that a spec missing from a grouped response is generated on its own."""
+        create = mock_async_client.chat.completions.create.side_effect
+
+        async def grouped_create(**kwargs):
+            if "Resources to Generate (2)" in kwargs["messages"][1]["content"]:
+                return _mock_response({"resources": [{"name": [{"family": "Doe"}]}]})
+            return await create(**kwargs)
+
+        mock_async_client.chat.completions.create.side_effect = grouped_create
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, resources_per_request=2)
+        specs = [
+            {"resourceType": "Patient", "assigned_id": "patient-1"},
+            {"resourceType": "Observation", "assigned_id": "obs-1"},
+        ]
+        outcomes = asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert [o["resource"]["id"] for o in outcomes] == ["patient-1", "obs-1"]
+        assert mock_async_client.chat.completions.create.await_count == 2
+
+    def test_pipelined_generation_respects_depends_on(self, simple_journey, mock_async_client):
+        """Test that a spec with depends_on is generated after its dependency."""
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        specs = [
+            {"resourceType": "Patient", "assigned_id": "patient-1"},
+            {"resourceType": "Observation", "depends_on": ["Patient"]},
+        ]
+
+        outcomes = asyncio.run(agent._generate_resources_pipelined(
+            specs, simple_journey, []))
+
+        assert [o["resource"]["resourceType"] for o in outcomes] == [
+            "Patient", "Observation"]
+        observation_prompt = mock_async_client.chat.completions.create.await_args_list[
+            1].kwargs["messages"][1]["content"]
+        assert "Patient/patient-1" in observation_prompt
+
+    def test_fix_stops_when_resource_is_unchanged(self, simple_journey, mock_async_client):
+        """Test that a fix returning an already-seen resource is not retried."""
+        invalid = {"resourceType": "Observation", "id": "obs-1", "code": {"text": "Headache"}}
+        mock_async_client.chat.completions.create.side_effect = None
+        mock_async_client.chat.completions.create.return_value = _mock_response(
+            invalid)
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, max_fix_retries=3)
+        validation = agent.validator.validate(invalid)
+        fixed = asyncio.run(agent._fix_invalid_resource_async(
+            invalid, validation, {"resourceType": "Observation", "assigned_id": "obs-1"},
+            simple_journey, []))
+
+        assert fixed is None
+        assert mock_async_client.chat.completions.create.await_count == 1
+
+    def test_fix_errors_are_reported(self, simple_journey, mock_async_client, capsys):
+        """Test that an API error during a fix attempt is printed, not swallowed."""
+        invalid = {"resourceType": "Observation", "id": "obs-1", "code": {"text": "Headache"}}
+        mock_async_client.chat.completions.create.side_effect = RuntimeError("rate limited")
+
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, max_fix_retries=2)
+        fixed = asyncio.run(agent._fix_invalid_resource_async(
+            invalid, agent.validator.validate(invalid),
+            {"resourceType": "Observation", "assigned_id": "obs-1"}, simple_journey, []))
+
+        output = capsys.readouterr().out
+        assert fixed is None
+        assert "Error during Observation fix attempt 1: rate limited" in output
+        assert "Could not fix Observation after 2 attempts" in output
+
+    def test_structural_errors_are_repaired_without_llm(self, simple_journey, mock_async_client):
+        """Test that locally repairable resources are fixed without a fix request."""
+        invalid = {"resourceType": "Observation", "id": "obs-1", "status": "final",
+                   "code": "Headache", "effectiveDateTime": "2024-1-5"}
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        validation = agent.validator.validate(invalid)
+        assert validation.is_valid is False
+
+        fixed = asyncio.run(agent._fix_invalid_resource_async(
+            invalid, validation, {"resourceType": "Observation", "assigned_id": "obs-1"},
+            simple_journey, []))
+
+        assert fixed["code"] == {"text": "Headache"}
+        assert fixed["effectiveDateTime"] == "2024-01-05"
+        assert mock_async_client.chat.completions.create.await_count == 0
+
+    def test_plan_is_ordered_by_dependencies(self, mock_async_client):
+        """Test that planned specs are sorted so dependencies come first."""
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        plan = agent._parse_generation_plan({"resources": [
+            {"resourceType": "Observation", "depends_on": ["Encounter", "Device"]},
+            {"resourceType": "Encounter", "depends_on": ["Patient"]},
+            {"resourceType": "Patient"},
+            {"resourceType": "Condition"},
+        ]})
+
+        assert [r["resourceType"] for r in plan.resources_to_generate] == [
+            "Patient", "Condition", "Encounter", "Observation"]
+        assert plan.resources_to_generate[3]["depends_on"] == ["Encounter"]
+
+    def test_string_and_invalid_depends_on(self, mock_async_client):
+        """Test that depends_on given as a string or a non-list is normalized."""
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        plan = agent._parse_generation_plan({"resources": [
+            {"resourceType": "Encounter", "depends_on": "Patient"},
+            {"resourceType": "Condition", "depends_on": 5},
+            {"resourceType": "Patient"},
+        ]})
+
+        assert [r["resourceType"] for r in plan.resources_to_generate] == [
+            "Condition", "Patient", "Encounter"]
+        assert plan.resources_to_generate[0]["depends_on"] == []
+        assert plan.resources_to_generate[2]["depends_on"] == ["Patient"]
+
+    def test_response_cache_replays_run(self, simple_journey, mock_async_client, tmp_path):
+        """Test that a re-run with a response cache makes no API calls."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", auto_save=False, cache_directory=str(tmp_path))
+
+        first = asyncio.run(agent.agenerate_from_journey(simple_journey))
+        calls = mock_async_client.chat.completions.create.await_count
+        second = asyncio.run(agent.agenerate_from_journey(simple_journey))
+
+        assert calls == 4
+        assert mock_async_client.chat.completions.create.await_count == calls
+        assert second.generated_resources == first.generated_resources
+
+    def test_generate_from_journey_wraps_async(self, simple_journey, mock_async_client):
+        """Test that the sync entry point runs the async workflow."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", parallel_generation=False, auto_save=False)
+        result = agent.generate_from_journey(simple_journey)
+
+        assert result.success is True
+        assert len(result.generated_resources) == 2
+
+    def test_async_client_is_per_event_loop(self, simple_journey, mock_async_client):
+        """Test that each sync run gets its own async client and closes it."""
+        agent = AIJourneyToFHIR(
+            api_key="test-key", parallel_generation=False, auto_save=False)
+
+        with patch("open_compute.agents.ai_journey_to_fhir.AsyncOpenAI",
+                   return_value=mock_async_client) as client_class:
+            agent.generate_from_journey(simple_journey)
+            agent.generate_from_journey(simple_journey)
+
+        assert client_class.call_count == 2
+        assert mock_async_client.close.await_count == 2
+        assert agent.async_client is None
+
+    def test_agenerate_fhir_from_journey(self, simple_journey, mock_async_client):
+        """Test the async convenience function."""
+        result = asyncio.run(agenerate_fhir_from_journey(
+            journey=simple_journey, api_key="test-key", auto_save=False))
+
+        assert isinstance(result, GenerationResult)
+        assert result.success is True
+
+
+class TestBatchGeneration:
+    """Test Batch API generation with a mocked OpenAI client."""
+
+    @pytest.fixture
+    def mock_openai_client(self):
+        """Fixture providing a mocked OpenAI client."""
+        with patch("open_compute.agents.ai_journey_to_fhir.OpenAI") as mock:
+            client = MagicMock()
+            mock.return_value = client
+            yield client
+
+    @staticmethod
+    def _batch_output(outputs):
+        """Build the JSONL content of a batch output file."""
+        return "\n".join(
+            json.dumps({
+                "custom_id": custom_id,
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": json.dumps(content)}}]},
+                },
+            })
+            for custom_id, content in outputs.items()
+        )
+
+    def test_build_batch_request(self, simple_journey, mock_openai_client):
+        """Test that batch requests target the chat completions endpoint."""
+        agent = AIJourneyToFHIR(api_key="test-key")
+        messages = agent._build_planning_messages(simple_journey)
+        request = agent._build_batch_request("plan-0", messages)
+
+        assert request["custom_id"] == "plan-0"
+        assert request["method"] == "POST"
+        assert request["url"] == "/v1/chat/completions"
+        assert request["body"]["model"] == agent.model
+        assert request["body"]["messages"] == messages
+
+    def test_generate_from_journeys_batch(self, simple_journey, complex_journey, mock_openai_client):
+        """Test that batch outputs are mapped back to their journeys by custom_id."""
+        plan = {
+            "rationale": "Patient only",
+            "resources": [{"resourceType": "Patient", "description": "Demographics"}],
+        }
+        patient = {"resourceType": "Patient",
+                   "name": [{"family": "Doe", "given": ["John"]}]}
+
+        mock_openai_client.batches.create.side_effect = [
+            MagicMock(id="batch-plan", status="completed",
+                      output_file_id="out-plan"),
+            MagicMock(id="batch-gen", status="completed",
+                      output_file_id="out-gen"),
+        ]
+        mock_openai_client.files.content.side_effect = [
+            MagicMock(text=self._batch_output(
+                {"plan-1": plan, "plan-0": plan})),
+            MagicMock(text=self._batch_output(
+                {"gen-0-0": patient, "gen-1-0": patient})),
+        ]
+
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        results = agent.generate_from_journeys_batch(
+            [simple_journey, complex_journey], poll_interval=0)
+
+        assert mock_openai_client.files.create.call_count == 2
+        assert mock_openai_client.batches.create.call_args.kwargs[
+            "endpoint"] == "/v1/chat/completions"
+        assert len(results) == 2
+        for result in results:
+            assert result.success is True
+            assert len(result.generated_resources) == 1
+            assert result.generated_resources[0]["id"] == \
+                result.planning_details.resource_id_map["Patient"]
+
+    def test_batch_tolerates_malformed_outputs(self, simple_journey, complex_journey,
+                                              mock_openai_client):
+        """Test that a malformed plan or resource only fails its own journey."""
+        plan = {"resources": [{"resourceType": "Patient"}]}
+
+        mock_openai_client.batches.create.side_effect = [
+            MagicMock(id="batch-plan", status="completed",
+                      output_file_id="out-plan"),
+            MagicMock(id="batch-gen", status="completed",
+                      output_file_id="out-gen"),
+        ]
+        mock_openai_client.files.content.side_effect = [
+            MagicMock(text=self._batch_output(
+                {"plan-0": {"resources": "x"}, "plan-1": plan})),
+            MagicMock(text=self._batch_output({"gen-1-0": [plan]})),
+        ]
+
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        results = agent.generate_from_journeys_batch(
+            [simple_journey, complex_journey], poll_interval=0)
+
+        assert results[0].success is False
+        assert results[0].errors == ["Failed to create a generation plan"]
+        assert results[1].success is False
+        assert "Failed to generate Patient" in results[1].errors
+
+    def test_batch_fixes_share_one_event_loop(self, simple_journey, complex_journey,
+                                              mock_openai_client):
+        """Test that realtime fixes for all journeys run on one async client."""
+        plan = {"resources": [{"resourceType": "Observation"}]}
+        invalid = {"code": {"text": "Headache"}}
+        fixed = {"resourceType": "Observation", "status": "final",
+                 "code": {"text": "Headache"}}
+
+        mock_openai_client.batches.create.side_effect = [
+            MagicMock(id="batch-plan", status="completed",
+                      output_file_id="out-plan"),
+            MagicMock(id="batch-gen", status="completed",
+                      output_file_id="out-gen"),
+        ]
+        mock_openai_client.files.content.side_effect = [
+            MagicMock(text=self._batch_output(
+                {"plan-0": plan, "plan-1": plan})),
+            MagicMock(text=self._batch_output(
+                {"gen-0-0": invalid, "gen-1-0": invalid})),
+        ]
+
+        with patch("open_compute.agents.ai_journey_to_fhir.AsyncOpenAI") as async_openai:
+            async_client = MagicMock()
+            async_client.chat.completions.create = AsyncMock(
+                side_effect=lambda **kwargs: _mock_response(fixed))
+            async_client.close = AsyncMock()
+            async_openai.return_value = async_client
+
+            agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+            results = agent.generate_from_journeys_batch(
+                [simple_journey, complex_journey], poll_interval=0)
+
+        assert [result.success for result in results] == [True, True]
+        assert async_client.chat.completions.create.await_count == 2
+        assert async_openai.call_count == 1
+
+    def test_generate_from_journeys_batch_combined_save(self, simple_journey, complex_journey,
+                                                        mock_openai_client, tmp_path):
+        """Test that combined_save writes one JSONL file for all journeys."""
+        plan = {"resources": [{"resourceType": "Patient"}]}
+        patient = {"name": [{"family": "Doe", "given": ["John"]}]}
+
+        mock_openai_client.batches.create.side_effect = [
+            MagicMock(id="batch-plan", status="completed",
+                      output_file_id="out-plan"),
+            MagicMock(id="batch-gen", status="completed",
+                      output_file_id="out-gen"),
+        ]
+        mock_openai_client.files.content.side_effect = [
+            MagicMock(text=self._batch_output(
+                {"plan-0": plan, "plan-1": plan})),
+            MagicMock(text=self._batch_output(
+                {"gen-0-0": patient, "gen-1-0": patient})),
+        ]
+
+        agent = AIJourneyToFHIR(api_key="test-key", save_directory=str(tmp_path))
+        results = agent.generate_from_journeys_batch(
+            [simple_journey, complex_journey], poll_interval=0, combined_save=True)
+
+        combined = tmp_path / "all_patients.jsonl"
+        lines = combined.read_text().splitlines()
+        assert [json.loads(line)["resourceType"] for line in lines] == [
+            "Patient", "Patient"]
+        assert all(result.saved_path == str(combined) for result in results)
+        assert list(tmp_path.iterdir()) == [combined]
+
+    def test_save_combined_jsonl(self, tmp_path):
+        """Test that results saved together share one JSONL file."""
+        agent = AIJourneyToFHIR(api_key="test-key", save_directory=str(tmp_path / "out"))
+        patient = {"resourceType": "Patient", "id": "p1"}
+        results = [
+            GenerationResult(success=True, fhir_data=FHIRPatientData(
+                entries=[{"resource": patient}])),
+            GenerationResult(success=False),
+        ]
+
+        saved_path = agent.save_combined_jsonl(results)
+
+        assert saved_path == str(tmp_path / "out" / "all_patients.jsonl")
+        assert [json.loads(line) for line in open(saved_path)] == [patient]
+        assert results[0].saved_path == saved_path
+        assert results[1].saved_path is None
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_streamed_bundle_matches_json_dumps(self, tmp_path, indent):
+        """Test that the streamed Bundle is the same JSON as dumping it whole."""
+        header = {"resourceType": "Bundle", "type": "collection"}
+        separators = None if indent else (",", ":")
+        path = tmp_path / "patient_bundle.json"
+        for entries in ([], [{"resource": {"resourceType": "Patient", "name": [{"given": ["Zoë"]}]}},
+                             {"resource": {"resourceType": "Observation", "note": [{"text": "a\nb"}]}}]):
+            AIJourneyToFHIR._write_bundle(path, header, entries, indent)
+
+            assert path.read_text(encoding="utf-8") == json.dumps(
+                dict(header, entry=entries), indent=indent, separators=separators,
+                ensure_ascii=False)
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """Test that a write failing midway leaves the old file and no temp file."""
+        path = tmp_path / "bulk_fhir.jsonl"
+        AIJourneyToFHIR._write_jsonl(path, [{"resourceType": "Patient"}])
+
+        def resources():
+            yield {"resourceType": "Observation"}
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            AIJourneyToFHIR._write_jsonl(path, resources())
+
+        assert path.read_text() == '{"resourceType": "Patient"}\n'
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_generate_from_journeys_batch_failed_job(self, simple_journey, mock_openai_client):
+        """Test that a failed planning batch yields failed results."""
+        mock_openai_client.batches.create.return_value = MagicMock(
+            id="batch-plan", status="failed", output_file_id=None)
+
+        agent = AIJourneyToFHIR(api_key="test-key", auto_save=False)
+        results = agent.generate_from_journeys_batch(
+            [simple_journey], poll_interval=0)
+
+        assert len(results) == 1
+        assert results[0].success is False
+        assert "Failed to create a generation plan" in results[0].errors
+
+
 class TestConvenienceFunction:
     """Test the convenience function."""
 
@@ -0,0 +1,75 @@
+"""
+Tests for the FHIR data loader module.
+
+These tests use the FHIR data files bundled with the package.
+"""
+
+import os
+
+import pytest
+
+from open_compute.utils.fhir_data_loader import FHIRDataLoader, get_data_loader
+from open_compute.utils.fhir_schema_loader import get_schema_loader
+
+
+@pytest.fixture
+def data_loader():
+    """Fixture providing the shared data loader for the bundled FHIR data."""
+    return get_data_loader()
+
+
+class TestGetDataLoader:
+    """Test the shared data loader accessor."""
+
+    def test_returns_loaded_instance(self, data_loader):
+        """Test that the bundled FHIR data is found and loaded."""
+        assert isinstance(data_loader, FHIRDataLoader)
+        assert data_loader.is_loaded()
+
+    def test_default_loader_is_shared(self, data_loader):
+        """Test that repeated calls reuse the same parsed data."""
+        assert get_data_loader() is data_loader
+
+    def test_loader_cached_per_directory(self, data_loader, tmp_path):
+        """Test that an explicit directory gets its own cached loader."""
+        loader = get_data_loader(str(tmp_path))
+        assert loader is not data_loader
+        assert get_data_loader(str(tmp_path)) is loader
+        assert get_data_loader(str(tmp_path / ".." / tmp_path.name)) is loader
+
+    def test_prompt_context_is_memoized(self, data_loader):
+        """Test that prompt context is formatted once per resource type."""
+        context = data_loader.format_enhanced_context_for_prompt("Patient")
+        assert "Patient" in context
+        assert data_loader.format_enhanced_context_for_prompt("Patient") is context
+
+
+class TestGetSchemaLoader:
+    """Test the shared schema loader accessor."""
+
+    def test_loader_cached_per_file(self, tmp_path):
+        """Test that a schema file is parsed once until it changes."""
+        schema_file = tmp_path / "fhir.schema.json"
+        schema_file.write_text('{"definitions": {}}')
+        loader = get_schema_loader(str(schema_file))
+        assert loader.is_loaded()
+        assert get_schema_loader(str(schema_file)) is loader
+
+        schema_file.write_text('{"definitions": {"Patient": {}}}')
+        mtime = schema_file.stat().st_mtime + 5
+        os.utime(schema_file, (mtime, mtime))
+        reloaded = get_schema_loader(str(schema_file))
+        assert reloaded is not loader
+        assert reloaded.get_resource_definition("Patient") == {}
+
+    def test_prompt_schema_is_memoized_per_loader(self, tmp_path):
+        """Test that prompt schemas are formatted once and kept on the loader."""
+        schema_file = tmp_path / "fhir.schema.json"
+        schema_file.write_text(
+            '{"definitions": {"Patient": {"description": "A patient"}}}')
+        loader = get_schema_loader(str(schema_file))
+
+        schema = loader.format_schema_for_prompt("Patient")
+        assert "A patient" in schema
+        assert loader.format_schema_for_prompt("Patient") is schema
+        assert list(loader._prompt_schemas) == [("Patient", 20)]
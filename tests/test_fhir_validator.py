@@ -44,6 +44,15 @@ class TestValidationResult:
         assert "Invalid" in str(result)
         assert "Error 1" in str(result)
 
+    def test_repr_omits_validated_resource(self):
+        """Test that repr() does not format the validated model."""
+        validator = FHIRValidator(version="R4")
+        result = validator.validate({"resourceType": "Patient", "id": "example"})
+
+        assert result.validated_resource is not None
+        assert repr(result) == (
+            "ValidationResult(is_valid=True, errors=[], resource_type='Patient')")
+
     def test_to_dict(self):
         """Test conversion to dictionary."""
         result = ValidationResult(
@@ -378,6 +387,49 @@ class TestFHIRValidator:
         assert result.is_valid is True
         assert len(result.entry_results) == 0
 
+    def test_validate_bundle_batches_entries_by_type(self):
+        """Test that grouped entry validation still reports each bad entry."""
+        validator = FHIRValidator(version="R4")
+
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "entry": [
+                {"resource": {"resourceType": "Patient", "id": "p1"}},
+                {"resource": {"resourceType": "Observation", "status": "final",
+                              "code": {"text": "Heart rate"}}},
+                {"resource": {"resourceType": "Patient", "gender": 5}},
+                {"resource": {"resourceType": "Patient", "id": "p2"}},
+            ]
+        }
+
+        result = validator.validate_bundle(bundle)
+
+        assert [e["index"] for e in result.entry_results] == [0, 1, 2, 3]
+        assert [e["result"].is_valid for e in result.entry_results] == [
+            True, True, False, True]
+        assert result.entry_results[2]["result"].errors
+        assert result.entry_results[3]["result"].validated_resource.id == "p2"
+
+    def test_validate_bundle_reuses_entry_models(self, monkeypatch):
+        """Test that entries of a valid Bundle are not validated a second time."""
+        validator = FHIRValidator(version="R4")
+        monkeypatch.setattr(validator, "_validate_entries", lambda resources: pytest.fail(
+            "entries of a valid Bundle should not be re-validated"))
+
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "entry": [{"resource": {"resourceType": "Patient", "id": "p1"}}]
+        }
+
+        result = validator.validate_bundle(bundle)
+
+        assert result.is_valid is True
+        entry_result = result.entry_results[0]["result"]
+        assert entry_result.resource_type == "Patient"
+        assert entry_result.validated_resource.id == "p1"
+
     def test_explicit_resource_type(self):
         """Test validation with explicit resource type parameter."""
         validator = FHIRValidator(version="R4")
@@ -394,6 +446,84 @@ class TestFHIRValidator:
         assert result.resource_type == "Patient"
 
 
+    def test_validation_results_are_cached(self):
+        """Test that identical resources reuse the cached validation result."""
+        validator = FHIRValidator(version="R4")
+        patient = {"resourceType": "Patient", "id": "example", "gender": "male"}
+
+        first = validator.validate(patient)
+        second = validator.validate(dict(reversed(list(patient.items()))))
+        other = validator.validate({**patient, "gender": "female"})
+
+        assert second == first
+        assert second.validated_resource is first.validated_resource
+        assert other.validated_resource is not first.validated_resource
+        assert len(validator._cache) == 2
+
+    def test_cached_results_are_not_shared(self):
+        """Test that modifying a returned result does not change later hits."""
+        validator = FHIRValidator(version="R4")
+        patient = {"resourceType": "Patient", "gender": "invalid"}
+
+        first = validator.validate(patient)
+        first.errors.append("added by caller")
+        second = validator.validate(patient)
+
+        assert second is not first
+        assert "added by caller" not in second.errors
+        assert second.errors == first.errors[:-1]
+
+    def test_validation_cache_evicts_oldest(self):
+        """Test that the cache keeps only the most recent results."""
+        validator = FHIRValidator(version="R4", cache_size=2)
+
+        for patient_id in ["a", "b", "c"]:
+            validator.validate({"resourceType": "Patient", "id": patient_id})
+
+        assert len(validator._cache) == 2
+        assert all("\"a\"" not in key[2] for key in validator._cache)
+
+
+    def test_warmup_loads_model_classes(self):
+        """Test that warmup resolves model classes and skips unknown types."""
+        from open_compute.utils.fhir_validator import _get_model_class
+
+        validator = FHIRValidator(version="R4")
+        _get_model_class.cache_clear()
+
+        validator.warmup(["Patient", "NotAResource"])
+
+        assert _get_model_class.cache_info().currsize == 1
+        assert validator.validate({"resourceType": "Patient"}).is_valid is True
+
+    def test_repair_fixes_structural_mistakes(self):
+        """Test that repair wraps bare values and pads dates without touching the input."""
+        validator = FHIRValidator(version="R4")
+        condition = {
+            "resourceType": "Condition",
+            "clinicalStatus": "active",
+            "subject": "Patient/p1",
+            "code": "Migraine",
+            "category": {"text": "problem-list-item"},
+            "onsetDateTime": "2024-3-7T10:00:00Z",
+        }
+
+        repaired = validator.repair(condition)
+
+        assert repaired == {
+            "resourceType": "Condition",
+            "clinicalStatus": {"text": "active"},
+            "subject": {"reference": "Patient/p1"},
+            "code": {"text": "Migraine"},
+            "category": [{"text": "problem-list-item"}],
+            "onsetDateTime": "2024-03-07T10:00:00Z",
+        }
+        assert condition["code"] == "Migraine"
+        assert validator.validate(repaired).is_valid is True
+        assert validator.repair(repaired) is None
+        assert validator.repair({"resourceType": "NotAResource"}) is None
+
+
 class TestConvenienceFunction:
     """Test the convenience validate_fhir_resource function."""
 
@@ -196,6 +196,46 @@ def test_save_bundle_structure():
         shutil.rmtree(temp_dir)
 
 
+
+def test_save_bundle_compact_json():
+    """Test that pretty_json=False writes a compact, equivalent bundle."""
+    temp_dir = tempfile.mkdtemp()
+    
+    try:
+        agent = AIJourneyToFHIR(
+            api_key="test-key",
+            auto_save=False,
+            save_directory=temp_dir,
+            pretty_json=False
+        )
+        
+        fhir_data = FHIRPatientData(
+            entries=[
+                {
+                    "resource": {
+                        "resourceType": "Patient",
+                        "id": "patient-123",
+                        "name": [{"given": ["José"], "family": "Doe"}]
+                    }
+                }
+            ]
+        )
+        
+        class MockJourney:
+            patient_id = "patient-123"
+        
+        save_path = agent._save_bundle(fhir_data, MockJourney())
+        
+        content = (Path(save_path) / "patient_bundle.json").read_text(encoding="utf-8")
+        assert "\n" not in content, "Compact bundle should be a single line"
+        assert json.loads(content)["entry"] == fhir_data.entries
+        assert "José" in content, "Non-ASCII text should not be escaped"
+        print("✓ Compact patient_bundle.json written")
+        
+    finally:
+        shutil.rmtree(temp_dir)
+
+
 if __name__ == "__main__":
     print("Testing Save Structure Functionality")
     print("=" * 60)
@@ -206,6 +246,9 @@ if __name__ == "__main__":
     print("\n2. Testing save bundle structure...")
     test_save_bundle_structure()
     
+    print("\n3. Testing compact bundle output...")
+    test_save_bundle_compact_json()
+    
     print("\n" + "=" * 60)
     print("All tests completed successfully! ✓")
 